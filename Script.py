@@ -25,7 +25,8 @@ Olay aman vishwakarma ne add Kiya hai
 /users To get users details
 /ban user/channel id dan
 /unban user/channel id undan
-/restart bot is restart</b>"""
+/restart bot is restart
+/index index BIN_CHANNEL files</b>"""
 
     HELP2_TXT = """<b>Hᴏᴡ ᴛᴏ Uꜱᴇ Fɪʟᴇ ᴛᴏ Lɪɴᴋ Bᴏᴛ
 
@@ -23,6 +23,8 @@ from web import web_server
 from web.server import Webavbot
 from utils import temp, ping_server
 from web.server.clients import initialize_clients
+from web.utils.indexer import index_all_clients
+from web.utils.media_sessions import keep_media_sessions
 
 #Dont Remove My Credit @AV_BOTz_UPDATE 
 #This Repo Is By @BOT_OWNER26 
@@ -56,6 +58,9 @@ async def start():
     
     if ON_HEROKU:
         asyncio.create_task(ping_server())
+    if INDEX_ON_START:
+        asyncio.create_task(index_all_clients())
+    asyncio.create_task(keep_media_sessions())
     me = await Webavbot.get_me()
     temp.BOT = Webavbot
     temp.ME = me.id
@@ -67,7 +72,8 @@ async def start():
     time = now.strftime("%H:%M:%S %p")
     await Webavbot.send_message(LOG_CHANNEL, text=script.RESTART_TXT.format(today, time))
     await Webavbot.send_message(ADMINS[0], text='<b>ʙᴏᴛ ʀᴇsᴛᴀʀᴛᴇᴅ !!</b>')
-    app = web.AppRunner(await web_server())
+    # cancel the handler as soon as the client goes away, not on the next write of its stream
+    app = web.AppRunner(await web_server(), handler_cancellation=True)
     await app.setup()
     bind_address = "0.0.0.0"
     await web.TCPSite(app, bind_address, PORT).start()
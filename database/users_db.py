@@ -1,5 +1,6 @@
 import re
 import motor.motor_asyncio
+from pymongo import UpdateOne
 from info import DATABASE_NAME, DATABASE_URI
 
 #Dont Remove My Credit @AV_BOTz_UPDATE 
@@ -12,6 +13,8 @@ class Database:
         self.db = self._client[database_name]
         self.col = self.db.users
         self.bannedList = self.db.bannedList
+        self.files = self.db.files
+        self.index_state = self.db.index_state
 
     def new_user(self, id, name):
         return dict(
@@ -74,6 +77,70 @@ class Database:
             return e
         
 
+    async def save_file(self, id, bot_id, file_id, unique_id, file_size, mime_type, file_name, date):
+        await self.files.update_one(
+            {'_id': int(id)},
+            {'$set': {
+                'unique_id': unique_id,
+                'file_size': file_size,
+                'mime_type': mime_type,
+                'file_name': file_name,
+                'date': date,
+                f'file_ids.{bot_id}': file_id,
+            }},
+            upsert=True
+        )
+
+    async def get_file(self, id):
+        return await self.files.find_one({'_id': int(id)})
+
+    async def save_files(self, bot_id, files):
+        if not files:
+            return
+        await self.files.bulk_write([
+            UpdateOne(
+                {'_id': int(file['id'])},
+                {'$set': {
+                    'unique_id': file['unique_id'],
+                    'file_size': file['file_size'],
+                    'mime_type': file['mime_type'],
+                    'file_name': file['file_name'],
+                    'date': file['date'],
+                    f'file_ids.{bot_id}': file['file_id'],
+                }},
+                upsert=True
+            ) for file in files
+        ], ordered=False)
+
+    async def set_media_index(self, id, offset, length):
+        await self.files.update_one(
+            {'_id': int(id)},
+            {'$set': {'media_index': {'offset': int(offset), 'length': int(length)}}},
+            upsert=True
+        )
+
+    async def get_media_index(self, id):
+        file = await self.files.find_one({'_id': int(id)}, {'media_index': 1})
+        return file.get('media_index') if file else None
+
+    async def set_file_crc(self, id, crc):
+        await self.files.update_one({'_id': int(id)}, {'$set': {'crc32': int(crc)}}, upsert=True)
+
+    async def get_file_crcs(self, ids):
+        files = self.files.find({'_id': {'$in': [int(id) for id in ids]}, 'crc32': {'$exists': True}}, {'crc32': 1})
+        return {file['_id']: file['crc32'] async for file in files}
+
+    async def get_index_offset(self, bot_id):
+        state = await self.index_state.find_one({'_id': int(bot_id)})
+        return state['offset'] if state else 1
+
+    async def set_index_offset(self, bot_id, offset):
+        await self.index_state.update_one({'_id': int(bot_id)}, {'$set': {'offset': int(offset)}}, upsert=True)
+
+#Dont Remove My Credit @AV_BOTz_UPDATE 
+#This Repo Is By @BOT_OWNER26 
+# For Any Kind Of Error Ask Us In Support Group @AV_SUPPORT_GROUP
+
 db = Database(DATABASE_URI, DATABASE_NAME)
 
 #Dont Remove My Credit @AV_BOTz_UPDATE 
@@ -83,6 +83,45 @@ if HAS_SSL:
     URL = "https://{}/".format(FQDN)
 else:
     URL = "http://{}{}/".format(FQDN, "" if NO_PORT else ":" + str(PORT))
+
+# streaming performance information
+PREFETCH_WINDOW = int(environ.get("PREFETCH_WINDOW", "1"))  # GetFile requests kept in flight per download, 1 = one by one
+STRIPE_DOWNLOAD = environ.get("STRIPE_DOWNLOAD", "False").lower() == "true"  # spread the parts of one download across all multi clients
+CHUNK_CACHE_SIZE = int(environ.get("CHUNK_CACHE_SIZE", "64"))  # MB of downloaded parts kept in memory and shared by all downloads, 0 = off
+DISK_CACHE_DIR = environ.get("DISK_CACHE_DIR", "")  # directory for the on-disk part cache, empty = off
+DISK_CACHE_SIZE = int(environ.get("DISK_CACHE_SIZE", "10240"))  # MB of downloaded parts kept on disk
+DISK_CACHE_BACKLOG = int(environ.get("DISK_CACHE_BACKLOG", "32"))  # MB of parts waiting to be written to disk, more are not cached
+FILE_CACHE_SIZE = int(environ.get("FILE_CACHE_SIZE", "1000"))  # file properties cached per client
+FILE_CACHE_TTL = int(environ.get("FILE_CACHE_TTL", "1800"))  # seconds before cached file properties are refreshed
+INDEX_ON_START = environ.get("INDEX_ON_START", "False").lower() == "true"  # backfill the file index of BIN_CHANNEL when the bot starts
+INDEX_SLEEP = float(environ.get("INDEX_SLEEP", "1"))  # seconds to wait between index batches of 200 messages
+BATCH_WINDOW = int(environ.get("BATCH_WINDOW", "5"))  # milliseconds to collect message lookups into one get_messages call, 0 = off
+TEMPLATE_AUTO_RELOAD = environ.get("TEMPLATE_AUTO_RELOAD", "False").lower() == "true"  # reload edited templates, for development
+PAGE_CACHE_SIZE = int(environ.get("PAGE_CACHE_SIZE", "1000"))  # rendered /watch pages kept in memory
+PAGE_CACHE_TTL = int(environ.get("PAGE_CACHE_TTL", "600"))  # seconds a rendered page is kept
+PAGE_CACHE_CONTROL = environ.get("PAGE_CACHE_CONTROL", "public, max-age=600")  # Cache-Control header of /watch pages
+STREAM_CACHE_CONTROL = environ.get("STREAM_CACHE_CONTROL", "public, max-age=86400")  # Cache-Control header of downloads and streams
+START_PART_SIZE = int(environ.get("START_PART_SIZE", "64"))  # KB of the first GetFile request of a range, doubled up to 1024 for long ranges
+MEDIA_INDEX = environ.get("MEDIA_INDEX", "True").lower() == "true"  # cache the moov atom / Cues at the end of MP4 and MKV files for fast playback start
+MEDIA_INDEX_CACHE_SIZE = int(environ.get("MEDIA_INDEX_CACHE_SIZE", "64"))  # MB of media indexes kept in memory
+MEDIA_INDEX_MAX_SIZE = int(environ.get("MEDIA_INDEX_MAX_SIZE", "16"))  # MB, bigger media indexes aren't cached
+THUMB_CACHE_SIZE = int(environ.get("THUMB_CACHE_SIZE", "32"))  # MB of thumbnails kept in memory, they are also kept in DISK_CACHE_DIR/thumbs
+THUMB_DISK_SIZE = int(environ.get("THUMB_DISK_SIZE", "256"))  # MB of thumbnails kept in DISK_CACHE_DIR/thumbs
+STREAM_BUFFER_SIZE = int(environ.get("STREAM_BUFFER_SIZE", "256"))  # KB buffered per connection before waiting for a slow client
+CLIENT_SCHEDULER = environ.get("CLIENT_SCHEDULER", "weighted")  # how a client is picked for a download: weighted or least_loaded
+WARM_DCS = [int(dc) for dc in environ.get("WARM_DCS", "").split(",") if dc.strip()]  # DCs every client opens a media session for on start, e.g. 1,2,4
+MEDIA_KEEPALIVE = int(environ.get("MEDIA_KEEPALIVE", "30"))  # seconds between pings of the warm media sessions, 0 = off
+MEDIA_KEEPALIVE_TIMEOUT = int(environ.get("MEDIA_KEEPALIVE_TIMEOUT", "10"))  # seconds a media session has to answer a ping
+MEDIA_SESSIONS = int(environ.get("MEDIA_SESSIONS", "2"))  # media sessions (connections) per DC and client, opened when the others are busy
+HEDGE_REQUESTS = environ.get("HEDGE_REQUESTS", "False").lower() == "true"  # request a slow part again on another session or client, first answer wins
+HEDGE_PERCENTILE = float(environ.get("HEDGE_PERCENTILE", "95"))  # percentile of the recent GetFile latencies a part may take before it is hedged
+HEDGE_MIN_DELAY = int(environ.get("HEDGE_MIN_DELAY", "300"))  # milliseconds a part may always take before it is hedged
+CDN_DOWNLOAD = environ.get("CDN_DOWNLOAD", "False").lower() == "true"  # let telegram redirect popular files to its CDN DCs
+FAILOVER_ATTEMPTS = int(environ.get("FAILOVER_ATTEMPTS", "3"))  # times a download resumes on another client after a failed part
+AGGREGATION_WINDOW = int(environ.get("AGGREGATION_WINDOW", "0"))  # seconds the parallel range connections of one IP to one file share a client, 0 = off, behind a reverse proxy set TRUSTED_PROXIES too or every user shares one IP
+FILE_PARTS_LIMIT = int(environ.get("FILE_PARTS_LIMIT", "4"))  # GetFile requests all the connections of one aggregated download keep in flight
+TRUSTED_PROXIES = [ip.strip() for ip in environ.get("TRUSTED_PROXIES", "").split(",") if ip.strip()]  # reverse proxy IPs whose X-Forwarded-For is used, e.g. 127.0.0.1, required behind a proxy (heroku's router is trusted on its own)
+ZIP_MAX_FILES = int(environ.get("ZIP_MAX_FILES", "100"))  # files one /zip bundle link may contain
       
 #Dont Remove My Credit @AV_BOTz_UPDATE 
 #This Repo Is By @BOT_OWNER26 
@@ -0,0 +1,32 @@
+import time
+from info import ADMINS
+from pyrogram import Client, filters
+from utils import get_readable_time
+from web.utils.indexer import indexing, index_all_clients, reset_index
+
+#Dont Remove My Credit @AV_BOTz_UPDATE 
+#This Repo Is By @BOT_OWNER26 
+# For Any Kind Of Error Ask Us In Support Group @AV_SUPPORT_GROUP
+
+@Client.on_message(filters.private & filters.command("index") & filters.user(ADMINS))
+async def index(bot, message):
+    if indexing:
+        text = "<b>Indexing is already running</b>\n"
+        for bot_id, status in indexing.items():
+            text += f"\n<code>{bot_id}</code>: {status['current']}/{status['last']} messages, {status['files']} files"
+        return await message.reply_text(text, quote=True)
+
+    args = message.command[1:]
+    if args and args[0] == "reset":
+        await reset_index()
+        return await message.reply_text("<b>Index progress reset, send /index to scan BIN_CHANNEL again</b>", quote=True)
+    last_id = int(args[0]) if args and args[0].isdigit() else None
+
+    sts = await message.reply_text("<b>Indexing BIN_CHANNEL...</b>", quote=True)
+    start_time = time.time()
+    total = await index_all_clients(last_id)
+    await sts.edit(f"<b>Indexing completed in {get_readable_time(time.time() - start_time)}\n\nIndexed Files: {total}</b>")
+
+#Dont Remove My Credit @AV_BOTz_UPDATE 
+#This Repo Is By @BOT_OWNER26 
+# For Any Kind Of Error Ask Us In Support Group @AV_SUPPORT_GROUP
@@ -2,7 +2,7 @@ import asyncio
 import os
 import time
 from database.users_db import db
-from web.utils.file_properties import get_hash
+from web.utils.file_properties import get_hash, index_file
 from pyrogram import Client, filters, enums
 from info import URL, BOT_USERNAME, BIN_CHANNEL, BAN_ALERT, FSUB, CHANNEL
 from utils import get_size
@@ -42,6 +42,7 @@ async def private_receive_handler(c: Client, m: Message):
 
     try:
         msg = await m.forward(chat_id=BIN_CHANNEL)
+        await index_file(c, msg)
         
         stream = f"{URL}watch/{msg.id}?hash={get_hash(msg)}"
         download = f"{URL}{msg.id}?hash={get_hash(msg)}"
@@ -1,7 +1,7 @@
 import asyncio
 import os
 import random
-from web.utils.file_properties import get_hash
+from web.utils.file_properties import get_hash, index_file
 from pyrogram import Client, filters, enums
 from info import BIN_CHANNEL, BAN_CHNL, BANNED_CHANNELS, URL, CHANNEL, BOT_USERNAME
 from utils import get_size
@@ -30,6 +30,7 @@ async def channel_receive_handler(bot: Client, broadcast: Message):
 
         # बॉट फाइल को BIN_CHANNEL में फॉरवर्ड करेगा
         msg = await broadcast.forward(chat_id=BIN_CHANNEL)
+        await index_file(bot, msg)
 
         # Stream & Download लिंक बनाए
         stream = f"{URL}watch/{msg.id}?hash={get_hash(msg)}"
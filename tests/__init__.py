@@ -0,0 +1,8 @@
+import os
+
+#Dont Remove My Credit @AV_BOTz_UPDATE 
+#This Repo Is By @BOT_OWNER26 
+# For Any Kind Of Error Ask Us In Support Group @AV_SUPPORT_GROUP
+
+# info.py reads the config on import, the database client only needs a valid URI
+os.environ.setdefault("DATABASE_URI", "mongodb://localhost")
@@ -0,0 +1,194 @@
+import os
+import types
+import base64
+import unittest
+from hashlib import sha256
+from unittest import mock
+from pyrogram import raw
+from pyrogram.crypto import aes, rsa
+from pyrogram.connection import Connection
+from web.utils import cdn, custom_dl
+from web.utils.custom_dl import ByteStreamer, CDN_BLOCK_SIZE
+
+#Dont Remove My Credit @AV_BOTz_UPDATE 
+#This Repo Is By @BOT_OWNER26 
+# For Any Kind Of Error Ask Us In Support Group @AV_SUPPORT_GROUP
+
+CDN_DC = 121
+DATA = os.urandom(8 * CDN_BLOCK_SIZE)
+KEY = os.urandom(32)
+IV = os.urandom(12) + bytes(4)
+# the CDN encrypts the whole file as one AES-256-CTR stream, a part at an offset starts at counter offset / 16
+ENCRYPTED = aes.ctr256_encrypt(DATA, KEY, bytearray(IV))
+
+def file_hashes(first: int, last: int, corrupt: int = -1):
+    return [
+        raw.types.FileHash(
+            offset=offset,
+            limit=CDN_BLOCK_SIZE,
+            hash=bytes(32) if offset == corrupt else sha256(DATA[offset:offset + CDN_BLOCK_SIZE]).digest(),
+        )
+        for offset in range(first, last, CDN_BLOCK_SIZE)
+    ]
+
+class FakeMediaSession:
+    def __init__(self, corrupt: int = -1):
+        self.corrupt = corrupt
+        self.requests = []
+
+    async def send(self, query):
+        self.requests.append(query)
+        if isinstance(query, raw.functions.upload.GetFile):
+            if query.cdn_supported:
+                return raw.types.upload.FileCdnRedirect(
+                    dc_id=CDN_DC,
+                    file_token=b"token",
+                    encryption_key=KEY,
+                    encryption_iv=IV,
+                    file_hashes=file_hashes(0, 2 * CDN_BLOCK_SIZE, self.corrupt),
+                )
+            return raw.types.upload.File(
+                type=raw.types.storage.FileUnknown(), mtime=0, bytes=DATA[query.offset:query.offset + query.limit]
+            )
+        if isinstance(query, raw.functions.upload.GetCdnFileHashes):
+            return file_hashes(query.offset, query.offset + 2 * CDN_BLOCK_SIZE, self.corrupt)
+        raise AssertionError(f"Unexpected request {query}")
+
+class FakeCdnSession:
+    def __init__(self):
+        self.requests = []
+
+    async def send(self, query):
+        self.requests.append(query)
+        return raw.types.upload.CdnFile(bytes=ENCRYPTED[query.offset:query.offset + query.limit])
+
+class CdnDownloadTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.cdn_session = FakeCdnSession()
+        self.opened = []
+        self.patch = mock.patch.object(custom_dl, "CDN_DOWNLOAD", True)
+        self.patch.start()
+
+    def tearDown(self):
+        self.patch.stop()
+
+    def streamer(self, media_session: FakeMediaSession) -> ByteStreamer:
+        async def cdn_session_factory(client, dc_id):
+            self.opened.append(dc_id)
+            return self.cdn_session
+
+        async def get_media_session(dc_id):
+            return media_session
+
+        async def get_location(file_id):
+            return None
+
+        tg_connect = ByteStreamer(object(), 0)
+        tg_connect.cdn_session_factory = cdn_session_factory
+        tg_connect.get_media_session = get_media_session
+        tg_connect.get_location = get_location
+        return tg_connect
+
+    async def test_redirect_is_decrypted_and_verified(self):
+        media_session = FakeMediaSession()
+        tg_connect = self.streamer(media_session)
+        file_id = types.SimpleNamespace(dc_id=2, media_id=1, message_id=1)
+        offset, size = 4 * CDN_BLOCK_SIZE, 2 * CDN_BLOCK_SIZE
+
+        chunk = await tg_connect.fetch_part(file_id, offset, size)
+
+        self.assertEqual(chunk, DATA[offset:offset + size])
+        self.assertEqual(self.opened, [CDN_DC])
+        # the redirect only had the hashes of the first blocks, the others were requested
+        self.assertTrue(any(isinstance(q, raw.functions.upload.GetCdnFileHashes) for q in media_session.requests))
+        self.assertIsNone(tg_connect.cdn_failures.get(file_id.media_id))
+
+        # the cached redirect is used without asking the DC of the file again
+        requests = len(media_session.requests)
+        chunk = await tg_connect.fetch_part(file_id, 0, size)
+        self.assertEqual(chunk, DATA[:size])
+        self.assertEqual(len(media_session.requests), requests)
+        self.assertEqual(len(self.cdn_session.requests), 2)
+
+    async def test_hash_mismatch_falls_back_to_get_file(self):
+        media_session = FakeMediaSession(corrupt=CDN_BLOCK_SIZE)
+        tg_connect = self.streamer(media_session)
+        file_id = types.SimpleNamespace(dc_id=2, media_id=2, message_id=2)
+        size = 2 * CDN_BLOCK_SIZE
+
+        with self.assertLogs(level="WARNING"):
+            chunk = await tg_connect.fetch_part(file_id, 0, size)
+
+        self.assertEqual(chunk, DATA[:size])
+        self.assertTrue(tg_connect.cdn_failures.get(file_id.media_id))
+        self.assertIsNone(tg_connect.cdn_redirects.get(file_id.media_id))
+        last = media_session.requests[-1]
+        self.assertIsInstance(last, raw.functions.upload.GetFile)
+        self.assertFalse(last.cdn_supported)
+
+        # the media stays on GetFile until the failure expires
+        cdn_requests = len(self.cdn_session.requests)
+        chunk = await tg_connect.fetch_part(file_id, size, size)
+        self.assertEqual(chunk, DATA[size:2 * size])
+        self.assertEqual(len(self.cdn_session.requests), cdn_requests)
+
+#Dont Remove My Credit @AV_BOTz_UPDATE 
+#This Repo Is By @BOT_OWNER26 
+# For Any Kind Of Error Ask Us In Support Group @AV_SUPPORT_GROUP
+
+def to_pem(key: rsa.PublicKey) -> str:
+    def der(tag: int, value: bytes) -> bytes:
+        length = len(value)
+        if length < 0x80:
+            return bytes([tag, length]) + value
+        size = (length.bit_length() + 7) // 8
+        return bytes([tag, 0x80 | size]) + length.to_bytes(size, "big") + value
+
+    def integer(number: int) -> bytes:
+        return der(0x02, number.to_bytes(number.bit_length() // 8 + 1, "big"))
+
+    body = base64.b64encode(der(0x30, integer(key.m) + integer(key.e))).decode()
+    lines = [body[i:i + 64] for i in range(0, len(body), 64)]
+    return "\n".join(["-----BEGIN RSA PUBLIC KEY-----", *lines, "-----END RSA PUBLIC KEY-----"])
+
+class CdnConfigTest(unittest.IsolatedAsyncioTestCase):
+    async def test_load_resolves_addresses_and_keys(self):
+        fingerprint, key = next((f, k) for f, k in rsa.server_public_keys.items())
+        client = mock.Mock(ipv6=False, connection_factory=Connection)
+        client.invoke = mock.AsyncMock(side_effect=[
+            types.SimpleNamespace(dc_options=[
+                raw.types.DcOption(id=2, ip_address="149.154.167.50", port=443),
+                raw.types.DcOption(id=CDN_DC, ip_address="10.0.0.121", port=443, cdn=True),
+                raw.types.DcOption(id=CDN_DC, ip_address="2001:db8::121", port=443, cdn=True, ipv6=True),
+            ]),
+            raw.types.CdnConfig(public_keys=[raw.types.CdnPublicKey(dc_id=CDN_DC, public_key=to_pem(key))]),
+        ])
+        config = cdn.CdnConfig()
+
+        with mock.patch.object(cdn, "cdn_config", config), mock.patch.dict(rsa.server_public_keys, clear=True):
+            await config.load(client, CDN_DC)
+            self.assertEqual(rsa.server_public_keys, {fingerprint: key})
+            # the cached config is used for the next session
+            await config.load(client, CDN_DC)
+            self.assertEqual(client.invoke.await_count, 2)
+            with self.assertRaises(ValueError):
+                await config.load(client, 140)
+            self.assertEqual(client.invoke.await_count, 2)
+
+            cdn.use_cdn_connections(client)
+            self.assertIs(client.connection_factory, cdn.CdnConnection)
+            connection = client.connection_factory(
+                dc_id=CDN_DC, test_mode=False, ipv6=False, alt_port=False, proxy=None, media=False
+            )
+            self.assertEqual(connection.address, ("10.0.0.121", 443))
+            connection = client.connection_factory(
+                dc_id=2, test_mode=False, ipv6=False, alt_port=False, proxy=None, media=False
+            )
+            self.assertEqual(connection.address, Connection(2, False, False, False, None).address)
+
+#Dont Remove My Credit @AV_BOTz_UPDATE 
+#This Repo Is By @BOT_OWNER26 
+# For Any Kind Of Error Ask Us In Support Group @AV_SUPPORT_GROUP
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+import asyncio
+import types
+import unittest
+from unittest import mock
+from aiohttp import web
+from web import web_server
+from web.server import multi_clients, work_loads
+from web.server.scheduler import scheduler
+from web.utils.custom_dl import ByteStreamer
+
+#Dont Remove My Credit @AV_BOTz_UPDATE 
+#This Repo Is By @BOT_OWNER26 
+# For Any Kind Of Error Ask Us In Support Group @AV_SUPPORT_GROUP
+
+FILE_ID = types.SimpleNamespace(
+    unique_id="AgADxyz", file_size=8 * 1024 * 1024, mime_type="application/octet-stream",
+    file_name="file.bin", dc_id=2, media_id=1405, message_id=7, date=0,
+)
+
+class DisconnectTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.fetching = asyncio.Event()
+        self.cancelled = asyncio.Event()
+
+        async def fetch_part(tg_connect, file_id, offset, chunk_size, cdn=True):
+            self.fetching.set()
+            try:
+                await asyncio.sleep(3600)
+            except asyncio.CancelledError:
+                self.cancelled.set()
+                raise
+
+        async def get_file_properties(tg_connect, id):
+            return FILE_ID
+
+        self.patches = [
+            mock.patch.dict(multi_clients, {0: object()}),
+            mock.patch.dict(work_loads, {0: 0}),
+            mock.patch.object(scheduler, "pick", return_value=0),
+            mock.patch("web.stream_routes.note_dc"),
+            mock.patch.object(ByteStreamer, "fetch_part", fetch_part),
+            mock.patch.object(ByteStreamer, "get_file_properties", get_file_properties),
+        ]
+        for patch in self.patches:
+            patch.start()
+        # the same runner bot.py starts
+        self.runner = web.AppRunner(await web_server(), handler_cancellation=True)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+
+    async def asyncTearDown(self):
+        await self.runner.cleanup()
+        for patch in reversed(self.patches):
+            patch.stop()
+
+    async def test_disconnect_cancels_pending_fetch(self):
+        reader, writer = await asyncio.open_connection("127.0.0.1", self.port)
+        writer.write(f"GET /{FILE_ID.unique_id[:6]}7 HTTP/1.1\r\nHost: localhost\r\n\r\n".encode())
+        await writer.drain()
+        await asyncio.wait_for(self.fetching.wait(), 5)
+        self.assertEqual(work_loads[0], 1)
+
+        writer.close()
+        await asyncio.wait_for(self.cancelled.wait(), 5)
+        for _ in range(10):
+            await asyncio.sleep(0)
+        self.assertEqual(work_loads[0], 0)
+
+#Dont Remove My Credit @AV_BOTz_UPDATE 
+#This Repo Is By @BOT_OWNER26 
+# For Any Kind Of Error Ask Us In Support Group @AV_SUPPORT_GROUP
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,3 +1,4 @@
+import asyncio
 import logging
 logging.basicConfig(
     level=logging.INFO,
@@ -7,6 +8,7 @@ logging.getLogger("aiohttp").setLevel(logging.ERROR)
 logging.getLogger("pyrogram").setLevel(logging.ERROR)
 logging.getLogger("aiohttp.web").setLevel(logging.ERROR)
 from pyrogram import Client
+from pyrogram.errors import FloodWait
 from info import *
 from utils import temp
 from typing import Union, Optional, AsyncGenerator
@@ -48,7 +50,12 @@ class WebXBot(Client):
             new_diff = min(200, limit - current)
             if new_diff <= 0:
                 return
-            messages = await self.get_messages(chat_id, list(range(current, current+new_diff+1)))
+            try:
+                messages = await self.get_messages(chat_id, list(range(current, current+new_diff)))
+            except FloodWait as e:
+                logging.warning(f"Sleeping for {e.value}s due to FloodWait while iterating {chat_id}")
+                await asyncio.sleep(e.value)
+                continue
             for message in messages:
                 yield message
                 current += 1
@@ -4,6 +4,7 @@ from info import *
 from pyrogram import Client
 from web.utils.config_parser import TokenParser
 from web.server import multi_clients, work_loads, Webavbot
+from web.server.scheduler import scheduler
 
 #Dont Remove My Credit @AV_BOTz_UPDATE 
 #This Repo Is By @BOT_OWNER26 
@@ -12,7 +13,9 @@ from web.server import multi_clients, work_loads, Webavbot
 async def initialize_clients():
     multi_clients[0] = Webavbot
     work_loads[0] = 0
-    all_tokens = TokenParser().parse_from_env()
+    scheduler.add_client(0)
+    parser = TokenParser()
+    all_tokens = parser.parse_from_env()
     if not all_tokens:
         print("No additional clients found, using default client")
         return
@@ -33,6 +36,7 @@ async def initialize_clients():
                 in_memory=True
             ).start()
             work_loads[client_id] = 0
+            scheduler.add_client(client_id, parser.weights.get(client_id, 1.0))
             return client_id, client
         except Exception:
             logging.error(f"Failed starting Client - {client_id} Error:", exc_info=True)
@@ -0,0 +1,146 @@
+import time
+import logging
+from info import *
+from typing import Dict, Iterable, Optional
+from web.server import multi_clients, work_loads
+
+#Dont Remove My Credit @AV_BOTz_UPDATE 
+#This Repo Is By @BOT_OWNER26 
+# For Any Kind Of Error Ask Us In Support Group @AV_SUPPORT_GROUP
+
+EWMA_ALPHA = 0.2  # weight of the newest throughput sample
+DEFAULT_THROUGHPUT = 4 * 1024 * 1024  # bytes/s assumed for a client before anything was measured
+SESSION_COST = 1.0  # seconds it takes to open a media session for a new DC
+
+class ClientState:
+    def __init__(self, weight: float = 1.0):
+        """The live signals of one client.
+        attributes:
+            weight: the share of the traffic the client should get compared to the other clients.
+            bytes_in_flight: the bytes of the GetFile requests the client is waiting for.
+            throughput: the EWMA of the bytes per second the client downloaded, None until measured.
+            flood_until: the monotonic time the FloodWait of the client ends.
+        """
+        self.weight = weight
+        self.bytes_in_flight = 0
+        self.throughput: Optional[float] = None
+        self.flood_until = 0.0
+
+class Scheduler:
+    """
+    Picks the client that serves a request from the live signals of all clients.
+    subclasses only decide the cost of a client, a client in FloodWait is never picked
+    while another one is available.
+
+    functions:
+        add_client: registers a client with its weight.
+        pick: returns the index of the client that should serve a request.
+        started / finished: record a GetFile request of a client.
+        flood_wait: records a FloodWait of a client.
+        stats: returns the live signals of every client.
+    """
+
+    def __init__(self):
+        self.clients: Dict[int, ClientState] = {}
+
+    def add_client(self, index: int, weight: float = 1.0) -> None:
+        self.clients[index] = ClientState(weight)
+
+    def state(self, index: int) -> ClientState:
+        if index not in self.clients:
+            self.add_client(index)
+        return self.clients[index]
+
+    def is_throttled(self, index: int) -> bool:
+        return self.state(index).flood_until > time.monotonic()
+
+    def cost(self, index: int, dc_id: Optional[int]) -> float:
+        raise NotImplementedError
+
+    def pick(self, dc_id: Optional[int] = None, exclude: Iterable[int] = ()) -> int:
+        """
+        Returns the index of the cheapest client that isn't excluded or throttled,
+        or the client whose FloodWait ends first if every one of them is throttled.
+        """
+        candidates = [index for index in multi_clients if index not in exclude] or list(multi_clients)
+        available = [index for index in candidates if not self.is_throttled(index)]
+        if not available:
+            index = min(candidates, key=lambda i: self.state(i).flood_until)
+            logging.debug(f"Every client is throttled, using client {index}")
+            return index
+        return min(available, key=lambda i: (self.cost(i, dc_id), work_loads.get(i, 0)))
+
+#Dont Remove My Credit @AV_BOTz_UPDATE 
+#This Repo Is By @BOT_OWNER26 
+# For Any Kind Of Error Ask Us In Support Group @AV_SUPPORT_GROUP
+
+    def started(self, index: int, size: int) -> None:
+        self.state(index).bytes_in_flight += size
+
+    def finished(self, index: int, size: int, received: int, elapsed: float) -> None:
+        """
+        Records the end of a GetFile request and updates the throughput of the client with it.
+        """
+        state = self.state(index)
+        state.bytes_in_flight -= size
+        if received and elapsed > 0:
+            sample = received / elapsed
+            if state.throughput is None:
+                state.throughput = sample
+            else:
+                state.throughput += EWMA_ALPHA * (sample - state.throughput)
+
+    def flood_wait(self, index: int, seconds: float) -> None:
+        logging.warning(f"Client {index} got a FloodWait of {seconds}s, skipping it until it ends")
+        state = self.state(index)
+        state.flood_until = max(state.flood_until, time.monotonic() + seconds)
+
+    def stats(self) -> dict:
+        now = time.monotonic()
+        return {
+            "bot" + str(index + 1): {
+                "weight": state.weight,
+                "bytes_in_flight": state.bytes_in_flight,
+                "throughput": int(state.throughput or 0),
+                "flood_wait": max(0, int(state.flood_until - now)),
+            }
+            for index, state in sorted(self.clients.items())
+        }
+
+class LeastLoadedScheduler(Scheduler):
+    """
+    Picks the client with the fewest running downloads for its weight.
+    """
+
+    def cost(self, index: int, dc_id: Optional[int]) -> float:
+        return work_loads.get(index, 0) / self.state(index).weight
+
+class WeightedScheduler(Scheduler):
+    """
+    Picks the client that is expected to finish its queued bytes and one more part the soonest,
+    at its measured throughput scaled by its weight.
+    a client without a media session for the DC of the file pays for opening one.
+    """
+
+    def cost(self, index: int, dc_id: Optional[int]) -> float:
+        state = self.state(index)
+        throughput = state.throughput or self.average_throughput()
+        cost = (state.bytes_in_flight + 1024 * 1024) / (throughput * state.weight)
+        if dc_id is not None and dc_id not in getattr(multi_clients.get(index), "media_sessions", {}):
+            cost += SESSION_COST
+        return cost
+
+    def average_throughput(self) -> float:
+        measured = [state.throughput for state in self.clients.values() if state.throughput]
+        return sum(measured) / len(measured) if measured else DEFAULT_THROUGHPUT
+
+#Dont Remove My Credit @AV_BOTz_UPDATE 
+#This Repo Is By @BOT_OWNER26 
+# For Any Kind Of Error Ask Us In Support Group @AV_SUPPORT_GROUP
+
+schedulers = {
+    "least_loaded": LeastLoadedScheduler,
+    "weighted": WeightedScheduler,
+}
+
+scheduler: Scheduler = schedulers.get(CLIENT_SCHEDULER, WeightedScheduler)()
@@ -1,13 +1,25 @@
-import re, math, logging, secrets, mimetypes, time
+import re, asyncio, logging, secrets, mimetypes, time, hashlib
+from email.utils import formatdate
 from info import *
 from aiohttp import web
 from aiohttp.http_exceptions import BadStatusLine
 from web.server import multi_clients, work_loads, Webavbot
 from web.server.exceptions import FIleNotFound, InvalidHash
-from web.utils.custom_dl import ByteStreamer
+from web.server.scheduler import scheduler
+from web.utils.custom_dl import get_streamer, get_cached_dc_id
+from web.utils.media_sessions import note_dc
+from web.utils.media_index import media_indexes
+from web.utils.thumbnails import thumbnails, get_image_type
+from web.utils.cache import chunk_cache
+from web.utils.disk_cache import disk_cache
+from web.utils.latency import latency
+from web.utils.download_sessions import download_sessions, get_client_ip
+from web.utils.zip_stream import ZipBundle, ZipEntry
+from database.users_db import db
 from utils import get_readable_time
 from web.utils import StartTime, __version__
-from web.utils.render_template import render_page
+from web.utils.render_template import get_page
+from web.utils.ranges import parse_ranges, plan_parts, MultipartByteranges, MAX_PART_SIZE
 
 routes = web.RouteTableDef()
 
@@ -29,22 +41,80 @@ async def root_route_handler(_):
                     sorted(work_loads.items(), key=lambda x: x[1], reverse=True)
                 )
             ),
+            "scheduler": scheduler.stats(),
+            "latency": latency.stats(),
+            "chunk_cache": chunk_cache.stats(),
+            "disk_cache": disk_cache.stats() if disk_cache else None,
             "version": __version__,
         }
     )
 
+def parse_path(request: web.Request):
+    path = request.match_info["path"]
+    match = re.search(r"^([a-zA-Z0-9_-]{6})(\d+)$", path)
+    if match:
+        secure_hash = match.group(1)
+        id = int(match.group(2))
+    else:
+        id = int(re.search(r"(\d+)(?:\/\S+)?", path).group(1))
+        secure_hash = request.rel_url.query.get("hash")
+    return id, secure_hash
+
+def parse_zip_path(request: web.Request) -> list:
+    """
+    Parses the files of a bundle link, the download links of the files ({hash}{id}) joined by commas.
+    returns the (id, hash) of every file once, in order, or None if the link is malformed.
+    """
+    files = {}
+    for item in request.match_info["path"].strip("/").split(","):
+        match = re.fullmatch(r"([a-zA-Z0-9_-]{6})(\d+)", item.strip())
+        if not match:
+            return None
+        files.setdefault(int(match.group(2)), match.group(1))
+    return list(files.items())
+
+def etag_matches(request: web.Request, etag: str) -> bool:
+    if_none_match = request.headers.get("If-None-Match")
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return etag in [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+
+def get_validators(file_id) -> dict:
+    headers = {"ETag": f'"{file_id.unique_id}"', "Cache-Control": STREAM_CACHE_CONTROL}
+    if getattr(file_id, "date", 0):
+        headers["Last-Modified"] = formatdate(file_id.date, usegmt=True)
+    return headers
+
+def is_not_modified(request: web.Request, etag: str, date: int) -> bool:
+    if "If-None-Match" in request.headers:
+        return etag_matches(request, etag)
+    if_modified_since = request.if_modified_since
+    return bool(date and if_modified_since and date <= if_modified_since.timestamp())
+
+def if_range_matches(request: web.Request, etag: str, date: int) -> bool:
+    if_range = request.headers.get("If-Range", "").strip()
+    if not if_range:
+        return True
+    if if_range.startswith(('"', "W/")):
+        return if_range == etag
+    if_range_date = request.if_range
+    return bool(date and if_range_date and int(if_range_date.timestamp()) == date)
+
 @routes.get(r"/watch/{path:\S+}", allow_head=True)
 async def stream_handler(request: web.Request):
     try:
-        path = request.match_info["path"]
-        match = re.search(r"^([a-zA-Z0-9_-]{6})(\d+)$", path)
-        if match:
-            secure_hash = match.group(1)
-            id = int(match.group(2))
-        else:
-            id = int(re.search(r"(\d+)(?:\/\S+)?", path).group(1))
-            secure_hash = request.rel_url.query.get("hash")
-        return web.Response(text=await render_page(id, secure_hash), content_type='text/html')
+        id, secure_hash = parse_path(request)
+        page, etag = await get_page(id, secure_hash)
+        headers = {"ETag": etag, "Cache-Control": PAGE_CACHE_CONTROL}
+        if request.method == "GET":
+            # the player asks for the container index right after the page loads
+            tg_connect = get_streamer(0)
+            media_indexes.extract(tg_connect, await tg_connect.get_file_properties(id))
+        if etag_matches(request, etag):
+            return web.Response(status=304, headers=headers)
+        return web.Response(text=page, content_type='text/html', headers=headers)
     except InvalidHash as e:
         raise web.HTTPForbidden(text=e.message)
     except FIleNotFound as e:
@@ -59,17 +129,82 @@ async def stream_handler(request: web.Request):
 #This Repo Is By @BOT_OWNER26 
 # For Any Kind Of Error Ask Us In Support Group @AV_SUPPORT_GROUP
 
+@routes.get(r"/meta/{path:\S+}", allow_head=True)
+async def meta_handler(request: web.Request):
+    try:
+        id, secure_hash = parse_path(request)
+        file_id = await get_streamer(0).get_file_properties(id)
+        if file_id.unique_id[:6] != secure_hash:
+            raise InvalidHash
+        validators = get_validators(file_id)
+        if is_not_modified(request, validators["ETag"], getattr(file_id, "date", 0)):
+            return web.Response(status=304, headers=validators)
+        mime_type, file_name = get_mime_and_name(file_id)
+        return web.json_response(
+            {
+                "id": id,
+                "file_name": file_name,
+                "file_size": file_id.file_size,
+                "mime_type": mime_type,
+                "etag": validators["ETag"],
+                "last_modified": validators.get("Last-Modified"),
+            },
+            headers=validators,
+        )
+    except InvalidHash as e:
+        raise web.HTTPForbidden(text=e.message)
+    except FIleNotFound as e:
+        raise web.HTTPNotFound(text=e.message)
+    except (AttributeError, BadStatusLine, ConnectionResetError):
+        pass
+    except Exception as e:
+        logging.critical(e.with_traceback(None))
+        raise web.HTTPInternalServerError(text=str(e))
+
+@routes.get(r"/thumb/{path:\S+}", allow_head=True)
+async def thumb_handler(request: web.Request):
+    try:
+        id, secure_hash = parse_path(request)
+        tg_connect = get_streamer(0)
+        file_id = await tg_connect.get_file_properties(id)
+        if file_id.unique_id[:6] != secure_hash:
+            raise InvalidHash
+        headers = {"ETag": f'"{file_id.unique_id}-thumb"', "Cache-Control": STREAM_CACHE_CONTROL}
+        if etag_matches(request, headers["ETag"]):
+            return web.Response(status=304, headers=headers)
+        image = await thumbnails.get(tg_connect, file_id)
+        return web.Response(body=image, content_type=get_image_type(image), headers=headers)
+    except InvalidHash as e:
+        raise web.HTTPForbidden(text=e.message)
+    except FIleNotFound as e:
+        raise web.HTTPNotFound(text=e.message)
+    except (AttributeError, BadStatusLine, ConnectionResetError):
+        pass
+    except Exception as e:
+        logging.critical(e.with_traceback(None))
+        raise web.HTTPInternalServerError(text=str(e))
+
+@routes.get(r"/zip/{path:\S+}", allow_head=True)
+async def zip_handler(request: web.Request):
+    files = parse_zip_path(request)
+    if not files or len(files) > ZIP_MAX_FILES:
+        raise web.HTTPBadRequest(text=f"400: A bundle link has 1 to {ZIP_MAX_FILES} files")
+    try:
+        return await zip_streamer(request, files)
+    except InvalidHash as e:
+        raise web.HTTPForbidden(text=e.message)
+    except FIleNotFound as e:
+        raise web.HTTPNotFound(text=e.message)
+    except (AttributeError, BadStatusLine, ConnectionResetError):
+        pass
+    except Exception as e:
+        logging.critical(e.with_traceback(None))
+        raise web.HTTPInternalServerError(text=str(e))
+
 @routes.get(r"/{path:\S+}", allow_head=True)
 async def stream_handler(request: web.Request):
     try:
-        path = request.match_info["path"]
-        match = re.search(r"^([a-zA-Z0-9_-]{6})(\d+)$", path)
-        if match:
-            secure_hash = match.group(1)
-            id = int(match.group(2))
-        else:
-            id = int(re.search(r"(\d+)(?:\/\S+)?", path).group(1))
-            secure_hash = request.rel_url.query.get("hash")
+        id, secure_hash = parse_path(request)
         return await media_streamer(request, id, secure_hash)
     except InvalidHash as e:
         raise web.HTTPForbidden(text=e.message)
@@ -81,28 +216,63 @@ async def stream_handler(request: web.Request):
         logging.critical(e.with_traceback(None))
         raise web.HTTPInternalServerError(text=str(e))
 
-class_cache = {}
+def should_stripe(length: int, chunk_size: int) -> bool:
+    return STRIPE_DOWNLOAD and len(multi_clients) > 1 and length > chunk_size
+
+async def get_stripes(index: int, id: int) -> list:
+    """
+    Resolves the media of a message on every client, so one download can be striped across all of them.
+    the client of the given index is always the first stripe, clients that fail to resolve the file are skipped.
+    """
+    indexes = [index] + [i for i in multi_clients if i != index]
+    streamers = [get_streamer(i) for i in indexes]
+    file_ids = await asyncio.gather(
+        *[streamer.get_file_properties(id) for streamer in streamers],
+        return_exceptions=True,
+    )
+    stripes = []
+    for i, streamer, file_id in zip(indexes, streamers, file_ids):
+        if isinstance(file_id, Exception):
+            logging.debug(f"Client {i} can't stripe message with ID {id}: {file_id}")
+            continue
+        stripes.append((i, streamer, file_id))
+    logging.debug(f"Striping message with ID {id} across {len(stripes)} clients")
+    return stripes
 
 #Dont Remove My Credit @AV_BOTz_UPDATE 
 #This Repo Is By @BOT_OWNER26 
 # For Any Kind Of Error Ask Us In Support Group @AV_SUPPORT_GROUP
 
+def get_mime_and_name(file_id):
+    mime_type = file_id.mime_type
+    file_name = file_id.file_name
+
+    if mime_type:
+        if not file_name:
+            try:
+                file_name = f"{secrets.token_hex(2)}.{mime_type.split('/')[1]}"
+            except (IndexError, AttributeError):
+                file_name = f"{secrets.token_hex(2)}.unknown"
+    else:
+        if file_name:
+            mime_type = mimetypes.guess_type(file_id.file_name)[0] or "application/octet-stream"
+        else:
+            mime_type = "application/octet-stream"
+            file_name = f"{secrets.token_hex(2)}.unknown"
+    return mime_type, file_name
+
 async def media_streamer(request: web.Request, id: int, secure_hash: str):
     range_header = request.headers.get("Range", 0)
     
-    index = min(work_loads, key=work_loads.get)
-    faster_client = multi_clients[index]
+    client_ip = get_client_ip(request)
+    sibling = download_sessions.get(client_ip, id)
+    # the parallel range connections of a download manager stay on the client of their first connection
+    index = sibling.index if sibling else scheduler.pick(get_cached_dc_id(id))
     
     if MULTI_CLIENT:
         logging.info(f"Client {index} is now serving {request.remote}")
 
-    if faster_client in class_cache:
-        tg_connect = class_cache[faster_client]
-        logging.debug(f"Using cached ByteStreamer object for client {index}")
-    else:
-        logging.debug(f"Creating new ByteStreamer object for client {index}")
-        tg_connect = ByteStreamer(faster_client)
-        class_cache[faster_client] = tg_connect
+    tg_connect = get_streamer(index)
     logging.debug("before calling get_file_properties")
     file_id = await tg_connect.get_file_properties(id)
     logging.debug("after calling get_file_properties")
@@ -112,63 +282,183 @@ async def media_streamer(request: web.Request, id: int, secure_hash: str):
         raise InvalidHash
     
     file_size = file_id.file_size
+    date = getattr(file_id, "date", 0)
+    validators = get_validators(file_id)
 
-    if range_header:
-        from_bytes, until_bytes = range_header.replace("bytes=", "").split("-")
-        from_bytes = int(from_bytes)
-        until_bytes = int(until_bytes) if until_bytes else file_size - 1
-    else:
-        from_bytes = request.http_range.start or 0
-        until_bytes = (request.http_range.stop or file_size) - 1
+    if is_not_modified(request, validators["ETag"], date):
+        return web.Response(status=304, headers=validators)
+
+    if range_header and not if_range_matches(request, validators["ETag"], date):
+        logging.debug(f"If-Range doesn't match message with ID {id}, sending the whole file")
+        range_header = 0
 
-    if (until_bytes > file_size) or (from_bytes < 0) or (until_bytes < from_bytes):
+    ranges = parse_ranges(range_header, file_size) if range_header else None
+    if ranges == []:
         return web.Response(
             status=416,
             body="416: Range not satisfiable",
             headers={"Content-Range": f"bytes */{file_size}"},
         )
+    if not ranges:
+        range_header = 0
+        ranges = [(0, file_size - 1)]
+
+    chunk_size = MAX_PART_SIZE
 
-    chunk_size = 1024 * 1024
-    until_bytes = min(until_bytes, file_size - 1)
+    mime_type, file_name = get_mime_and_name(file_id)
+    disposition = "attachment"
+    stripes = None
+    download = None
+
+    def yield_range(from_bytes: int, until_bytes: int):
+        parts, first_part_cut, last_part_cut = plan_parts(from_bytes, until_bytes, START_PART_SIZE * 1024)
+        return tg_connect.yield_file(file_id, index, parts, first_part_cut, last_part_cut, stripes, download)
 
-    offset = from_bytes - (from_bytes % chunk_size)
-    first_part_cut = from_bytes - offset
-    last_part_cut = until_bytes % chunk_size + 1
+    headers = {
+        "Content-Disposition": f'{disposition}; filename="{file_name}"',
+        "Accept-Ranges": "bytes",
+        **validators,
+    }
 
+    if len(ranges) > 1:
+        multipart = MultipartByteranges(ranges, mime_type, file_size)
+        logging.debug(f"Sending {len(ranges)} ranges of message with ID {id}")
+        headers["Content-Type"] = multipart.content_type
+        headers["Content-Length"] = str(multipart.content_length)
+        if request.method == "HEAD":
+            return web.Response(status=206, headers=headers)
+        note_dc(file_id.dc_id)
+        media_indexes.extract(tg_connect, file_id)
+        stripes = await get_stripes(index, id) if should_stripe(file_size, chunk_size) else None
+        download = download_sessions.join(client_ip, id, index)
+        try:
+            return await stream_response(request, multipart.body(yield_range), 206, headers)
+        finally:
+            download_sessions.leave(download)
+
+    from_bytes, until_bytes = ranges[0]
     req_length = until_bytes - from_bytes + 1
-    part_count = math.ceil(until_bytes / chunk_size) - math.floor(offset / chunk_size)
-    body = tg_connect.yield_file(
-        file_id, index, offset, first_part_cut, last_part_cut, part_count, chunk_size
-    )
+    status = 206 if range_header else 200
+    headers["Content-Type"] = f"{mime_type}"
+    headers["Content-Range"] = f"bytes {from_bytes}-{until_bytes}/{file_size}"
+    headers["Content-Length"] = str(req_length)
 
-    mime_type = file_id.mime_type
-    file_name = file_id.file_name
-    disposition = "attachment"
+    if request.method == "HEAD":
+        return web.Response(status=status, headers=headers)
+    note_dc(file_id.dc_id)
+    media_indexes.extract(tg_connect, file_id)
 
-    if mime_type:
-        if not file_name:
-            try:
-                file_name = f"{secrets.token_hex(2)}.{mime_type.split('/')[1]}"
-            except (IndexError, AttributeError):
-                file_name = f"{secrets.token_hex(2)}.unknown"
-    else:
-        if file_name:
-            mime_type = mimetypes.guess_type(file_id.file_name)
-        else:
-            mime_type = "application/octet-stream"
-            file_name = f"{secrets.token_hex(2)}.unknown"
+    index_bytes = media_indexes.read(file_id, from_bytes, until_bytes)
+    if index_bytes is not None:
+        logging.debug(f"Serving the container index of message with ID {id} from memory")
+        return web.Response(status=status, body=index_bytes, headers=headers)
+
+    if disk_cache and disk_cache.covers(file_id.media_id, from_bytes, until_bytes):
+        logging.debug(f"Serving message with ID {id} from the disk cache")
+        return disk_cache.response(
+            file_id.media_id, from_bytes, req_length, status=status, headers=headers
+        )
 
-    return web.Response(
-        status=206 if range_header else 200,
-        body=body,
-        headers={
-            "Content-Type": f"{mime_type}",
-            "Content-Range": f"bytes {from_bytes}-{until_bytes}/{file_size}",
-            "Content-Length": str(req_length),
-            "Content-Disposition": f'{disposition}; filename="{file_name}"',
-            "Accept-Ranges": "bytes",
-        },
-  )
+    stripes = await get_stripes(index, id) if should_stripe(req_length, chunk_size) else None
+    download = download_sessions.join(client_ip, id, index)
+    try:
+        return await stream_response(request, yield_range(from_bytes, until_bytes), status, headers)
+    finally:
+        download_sessions.leave(download)
+
+async def zip_streamer(request: web.Request, files: list):
+    index = scheduler.pick()
+    tg_connect = get_streamer(index)
+    file_ids = await asyncio.gather(*[tg_connect.get_file_properties(id) for id, _ in files])
+    for (id, secure_hash), file_id in zip(files, file_ids):
+        if file_id.unique_id[:6] != secure_hash:
+            logging.debug(f"Invalid hash for message with ID {id}")
+            raise InvalidHash
+
+    crcs = await db.get_file_crcs([id for id, _ in files])
+    entries = []
+    for (id, _), file_id in zip(files, file_ids):
+        # the names must not change between requests, or a resumed download would get another archive
+        file_name = file_id.file_name or f"{id}.{(file_id.mime_type or '/bin').split('/')[-1]}"
+        entries.append(ZipEntry(id, file_name, file_id.file_size, getattr(file_id, "date", 0) or 0, file_id, crcs.get(id)))
+    bundle = ZipBundle(entries)
+
+    date = max(entry.date for entry in entries)
+    etag = '"zip-' + hashlib.sha1(",".join(f.unique_id for f in file_ids).encode()).hexdigest()[:20] + '"'
+    validators = {"ETag": etag, "Cache-Control": STREAM_CACHE_CONTROL}
+    if date:
+        validators["Last-Modified"] = formatdate(date, usegmt=True)
+    if is_not_modified(request, etag, date):
+        return web.Response(status=304, headers=validators)
+
+    range_header = request.headers.get("Range", 0)
+    if range_header and not if_range_matches(request, etag, date):
+        range_header = 0
+    ranges = parse_ranges(range_header, bundle.content_length) if range_header else None
+    if ranges == []:
+        return web.Response(
+            status=416,
+            body="416: Range not satisfiable",
+            headers={"Content-Range": f"bytes */{bundle.content_length}"},
+        )
+    # resuming needs one range, several ranges of an archive are answered with the whole archive
+    if not ranges or len(ranges) > 1:
+        range_header = 0
+        ranges = [(0, bundle.content_length - 1)]
+    from_bytes, until_bytes = ranges[0]
+
+    zip_name = re.sub(r'[\\/"]', "_", request.rel_url.query.get("name", "").strip()) or f"{len(entries)} files"
+    if not zip_name.lower().endswith(".zip"):
+        zip_name += ".zip"
+    status = 206 if range_header else 200
+    headers = {
+        "Content-Type": "application/zip",
+        "Content-Disposition": f'attachment; filename="{zip_name}"',
+        "Content-Range": f"bytes {from_bytes}-{until_bytes}/{bundle.content_length}",
+        "Content-Length": str(until_bytes - from_bytes + 1),
+        "Accept-Ranges": "bytes",
+        **validators,
+    }
+    if request.method == "HEAD":
+        return web.Response(status=status, headers=headers)
+
+    for file_id in file_ids:
+        note_dc(file_id.dc_id)
+    if MULTI_CLIENT:
+        logging.info(f"Client {index} is now serving a bundle of {len(entries)} files to {request.remote}")
+
+    def yield_range(entry: ZipEntry, first: int, last: int):
+        parts, first_part_cut, last_part_cut = plan_parts(first, last, START_PART_SIZE * 1024)
+        return tg_connect.yield_file(entry.file_id, index, parts, first_part_cut, last_part_cut)
+
+    async def save_crc(entry: ZipEntry) -> None:
+        try:
+            await db.set_file_crc(entry.id, entry.crc)
+        except Exception:
+            logging.error(f"Failed saving the CRC of message with ID {entry.id}", exc_info=True)
+
+    return await stream_response(request, bundle.body(yield_range, from_bytes, until_bytes, save_crc), status, headers)
+
+async def stream_response(request: web.Request, body, status: int, headers: dict) -> web.StreamResponse:
+    """
+    Writes the body to the client in slices of STREAM_BUFFER_SIZE, waiting for the transport to drain,
+    so a slow client never holds more than about two slices in our buffers.
+    the body is closed as soon as the client goes away, which cancels its pending telegram requests.
+    """
+    response = web.StreamResponse(status=status, headers=headers)
+    slice_size = STREAM_BUFFER_SIZE * 1024
+    if request.transport is not None:
+        request.transport.set_write_buffer_limits(high=slice_size)
+    await response.prepare(request)
+    try:
+        async for chunk in body:
+            chunk = memoryview(chunk)
+            for start in range(0, len(chunk), slice_size):
+                await response.write(chunk[start:start + slice_size])
+    finally:
+        await body.aclose()
+    await response.write_eof()
+    return response
 #Dont Remove My Credit @AV_BOTz_UPDATE 
 #This Repo Is By @BOT_OWNER26 
 # For Any Kind Of Error Ask Us In Support Group @AV_SUPPORT_GROUP
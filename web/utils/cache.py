@@ -0,0 +1,150 @@
+import time
+import asyncio
+import logging
+from info import *
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+
+#Dont Remove My Credit @AV_BOTz_UPDATE 
+#This Repo Is By @BOT_OWNER26 
+# For Any Kind Of Error Ask Us In Support Group @AV_SUPPORT_GROUP
+
+class ChunkCache:
+    def __init__(self, max_bytes: int):
+        """A process wide cache for the parts fetched from telegram, shared by every client.
+        attributes:
+            max_bytes: the total size of the cached parts, least recently used parts are evicted first.
+            chunks: the cached parts keyed by (media_id, offset, limit).
+            inflight: the parts that are being fetched right now with the number of requests waiting for them.
+
+        functions:
+            get: returns a cached part, or awaits the fetch that is already running for it, or starts one.
+            peek: returns a cached part without fetching it.
+            put: caches a part and evicts the least recently used ones.
+            stats: returns the hit and miss counters.
+        """
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.chunks: "OrderedDict[Hashable, bytes]" = OrderedDict()
+        self.inflight: Dict[Hashable, List] = {}
+        self.hits = 0
+        self.shared = 0
+        self.misses = 0
+
+    async def get(self, key: Hashable, fetch: Callable[[], Awaitable[bytes]]) -> bytes:
+        """
+        Returns the part for the key.
+        concurrent requests for a part that isn't cached share one fetch, which is cancelled
+        only when every request waiting for it has gone away.
+        """
+        chunk = self.chunks.get(key)
+        if chunk is not None:
+            self.chunks.move_to_end(key)
+            self.hits += 1
+            return chunk
+
+        entry = self.inflight.get(key)
+        if entry is None or entry[0].cancelled():
+            self.misses += 1
+            entry = [asyncio.ensure_future(fetch()), 0]
+            self.inflight[key] = entry
+            entry[0].add_done_callback(lambda task: self._fetched(key, task))
+        else:
+            self.shared += 1
+            logging.debug(f"Waiting for the running fetch of part {key}")
+
+        task = entry[0]
+        entry[1] += 1
+        try:
+            return await asyncio.shield(task)
+        finally:
+            entry[1] -= 1
+            if not entry[1] and not task.done():
+                task.cancel()
+                # a request that comes before the done callback runs starts a new fetch
+                if self.inflight.get(key) is entry:
+                    del self.inflight[key]
+
+    def peek(self, key: Hashable) -> Optional[bytes]:
+        """
+        Returns the cached part for the key without fetching it, or None.
+        """
+        chunk = self.chunks.get(key)
+        if chunk is not None:
+            self.chunks.move_to_end(key)
+            self.hits += 1
+        return chunk
+
+    def _fetched(self, key: Hashable, task: asyncio.Task) -> None:
+        entry = self.inflight.get(key)
+        if entry is not None and entry[0] is task:
+            del self.inflight[key]
+        if task.cancelled() or task.exception():
+            return
+        self.put(key, task.result())
+
+    def put(self, key: Hashable, chunk: bytes) -> None:
+        if not chunk or len(chunk) > self.max_bytes:
+            return
+        if key in self.chunks:
+            self.size -= len(self.chunks.pop(key))
+        self.chunks[key] = chunk
+        self.size += len(chunk)
+        while self.size > self.max_bytes:
+            _, evicted = self.chunks.popitem(last=False)
+            self.size -= len(evicted)
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "shared": self.shared,
+            "misses": self.misses,
+            "parts": len(self.chunks),
+            "size": self.size,
+        }
+
+#Dont Remove My Credit @AV_BOTz_UPDATE 
+#This Repo Is By @BOT_OWNER26 
+# For Any Kind Of Error Ask Us In Support Group @AV_SUPPORT_GROUP
+
+class TTLCache:
+    def __init__(self, max_size: int, ttl: float):
+        """A size bounded LRU cache whose entries go stale after a time to live.
+        stale entries are still returned, so the caller can keep using them while it refreshes them.
+        attributes:
+            max_size: the number of entries, least recently used entries are evicted first.
+            ttl: the seconds after which an entry is stale.
+            entries: the cached values with the time they go stale.
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self.entries: "OrderedDict[Hashable, Tuple[Any, float]]" = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[Tuple[Any, bool]]:
+        """
+        Returns the cached value and whether it is stale, or None if it isn't cached.
+        """
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        self.entries.move_to_end(key)
+        value, expires = entry
+        return value, time.monotonic() > expires
+
+    def set(self, key: Hashable, value: Any) -> None:
+        self.entries[key] = (value, time.monotonic() + self.ttl)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+    def pop(self, key: Hashable) -> None:
+        self.entries.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+#Dont Remove My Credit @AV_BOTz_UPDATE 
+#This Repo Is By @BOT_OWNER26 
+# For Any Kind Of Error Ask Us In Support Group @AV_SUPPORT_GROUP
+
+chunk_cache = ChunkCache(CHUNK_CACHE_SIZE * 1024 * 1024)
@@ -0,0 +1,148 @@
+import time
+import base64
+import asyncio
+import logging
+from hashlib import sha1
+from typing import Dict, Optional, Tuple
+from pyrogram import Client, raw
+from pyrogram.crypto import rsa
+from pyrogram.connection import Connection
+from pyrogram.connection.transport import TCPAbridged
+from pyrogram.raw.core.primitives import Bytes
+
+#Dont Remove My Credit @AV_BOTz_UPDATE 
+#This Repo Is By @BOT_OWNER26 
+# For Any Kind Of Error Ask Us In Support Group @AV_SUPPORT_GROUP
+
+CDN_CONFIG_TTL = 3600  # seconds the CDN DC addresses and keys are kept before they are loaded again
+CDN_CONFIG_RETRY = 60  # seconds before the config is loaded again for a CDN DC it didn't announce
+
+def read_der(data: bytes, pos: int) -> Tuple[int, int, int]:
+    """
+    Returns the (tag, first byte of the value, end of the value) of the DER element at pos.
+    """
+    tag, length = data[pos], data[pos + 1]
+    pos += 2
+    if length & 0x80:
+        size = length & 0x7F
+        length = int.from_bytes(data[pos:pos + size], "big")
+        pos += size
+    return tag, pos, pos + length
+
+def parse_public_key(pem: str) -> rsa.PublicKey:
+    """
+    Returns the modulus and exponent of a PKCS#1 "RSA PUBLIC KEY" in PEM format, as help.getCdnConfig sends them.
+    """
+    body = "".join(line for line in pem.strip().splitlines() if not line.startswith("-----"))
+    der = base64.b64decode(body)
+    tag, pos, _ = read_der(der, 0)
+    if tag != 0x30:
+        raise ValueError("Not an RSA public key")
+    numbers = []
+    for _ in range(2):
+        tag, start, pos = read_der(der, pos)
+        if tag != 0x02:
+            raise ValueError("Not an RSA public key")
+        numbers.append(int.from_bytes(der[start:pos], "big"))
+    return rsa.PublicKey(*numbers)
+
+def get_fingerprint(key: rsa.PublicKey) -> int:
+    """
+    Returns the fingerprint of an RSA key as telegram sends it in res_pq,
+    the lower 64 bits of the SHA1 of the TL serialized modulus and exponent.
+    """
+    m = key.m.to_bytes((key.m.bit_length() + 7) // 8, "big")
+    e = key.e.to_bytes((key.e.bit_length() + 7) // 8, "big")
+    return int.from_bytes(sha1(Bytes(m) + Bytes(e)).digest()[-8:], "little", signed=True)
+
+class CdnConfig:
+    def __init__(self):
+        """The addresses and RSA keys of the telegram CDN DCs, pyrogram only ships the ones of the main DCs.
+        attributes:
+            addresses: the (ip, port) of every CDN DC keyed by (dc_id, ipv6), from help.getConfig.
+            loaded: the monotonic time the config was last loaded, 0 if never.
+            lock: held while the config is loaded.
+
+        functions:
+            load: loads the config with a client unless the cached one knows the DC.
+            address: returns the address of a CDN DC, None if it isn't known.
+        """
+        self.addresses: Dict[Tuple[int, bool], Tuple[str, int]] = {}
+        self.loaded = 0.0
+        self.lock = asyncio.Lock()
+
+    def address(self, dc_id: int, ipv6: bool) -> Optional[Tuple[str, int]]:
+        return self.addresses.get((dc_id, ipv6))
+
+    def is_fresh(self, dc_id: int, ipv6: bool) -> bool:
+        age = time.monotonic() - self.loaded
+        if self.address(dc_id, ipv6) is not None:
+            return age < CDN_CONFIG_TTL
+        return self.loaded > 0 and age < CDN_CONFIG_RETRY
+
+    async def load(self, client: Client, dc_id: int) -> None:
+        """
+        Loads the CDN DC addresses from help.getConfig and their keys from help.getCdnConfig,
+        unless the cached config knows the DC. the keys are added to the ones pyrogram authorizes with.
+        raises ValueError if telegram doesn't announce the DC.
+        """
+        if not self.is_fresh(dc_id, client.ipv6):
+            async with self.lock:
+                if not self.is_fresh(dc_id, client.ipv6):
+                    config = await client.invoke(raw.functions.help.GetConfig())
+                    cdn = await client.invoke(raw.functions.help.GetCdnConfig())
+                    self.addresses = {
+                        (option.id, bool(option.ipv6)): (option.ip_address, option.port)
+                        for option in config.dc_options
+                        if option.cdn
+                    }
+                    for public_key in cdn.public_keys:
+                        key = parse_public_key(public_key.public_key)
+                        rsa.server_public_keys[get_fingerprint(key)] = key
+                    self.loaded = time.monotonic()
+                    logging.debug(f"Loaded the addresses of CDN DCs {sorted({dc for dc, _ in self.addresses})}")
+        if self.address(dc_id, client.ipv6) is None:
+            raise ValueError(f"Telegram didn't announce CDN DC {dc_id}")
+
+#Dont Remove My Credit @AV_BOTz_UPDATE 
+#This Repo Is By @BOT_OWNER26 
+# For Any Kind Of Error Ask Us In Support Group @AV_SUPPORT_GROUP
+
+class CdnConnection(Connection):
+    """
+    A pyrogram connection that finds the CDN DCs in the loaded CdnConfig,
+    and every other DC in the DataCenter table of pyrogram.
+    """
+
+    def __init__(
+        self,
+        dc_id: int,
+        test_mode: bool,
+        ipv6: bool,
+        alt_port: bool,
+        proxy: dict,
+        media: bool = False,
+        protocol_factory=TCPAbridged,
+    ) -> None:
+        address = cdn_config.address(dc_id, ipv6)
+        if address is None:
+            super().__init__(dc_id, test_mode, ipv6, alt_port, proxy, media, protocol_factory)
+            return
+        self.dc_id = dc_id
+        self.test_mode = test_mode
+        self.ipv6 = ipv6
+        self.alt_port = alt_port
+        self.proxy = proxy
+        self.media = media
+        self.protocol_factory = protocol_factory
+        self.address = address
+        self.protocol = None
+
+def use_cdn_connections(client: Client) -> None:
+    """
+    Lets the sessions of a client connect to CDN DCs, a custom connection_factory of the client is left alone.
+    """
+    if client.connection_factory is Connection:
+        client.connection_factory = CdnConnection
+
+cdn_config = CdnConfig()
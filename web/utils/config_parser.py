@@ -1,3 +1,5 @@
+import math
+import logging
 from os import environ
 from typing import Dict, Optional
 
@@ -8,19 +10,39 @@ from typing import Dict, Optional
 class TokenParser:
     def __init__(self, config_file: Optional[str] = None):
         self.tokens = {}
+        self.weights = {}
         self.config_file = config_file
 
     def parse_from_env(self) -> Dict[int, str]:
-        self.tokens = dict(
-            (c + 1, t)
-            for c, (_, t) in enumerate(
-                filter(
-                    lambda n: n[0].startswith("MULTI_TOKEN"), sorted(environ.items())
-                )
+        """
+        Returns the tokens of the MULTI_TOKEN variables.
+        a token can end with |weight (MULTI_TOKEN1=123:ABC|2) to give its client a bigger share of the downloads,
+        the weights are kept in self.weights, a weight that isn't a number above 0 is logged and replaced by 1.0.
+        """
+        self.tokens = {}
+        self.weights = {}
+        for c, (_, t) in enumerate(
+            filter(
+                lambda n: n[0].startswith("MULTI_TOKEN"), sorted(environ.items())
             )
-        )
+        ):
+            token, _, weight = t.partition("|")
+            self.tokens[c + 1] = token.strip()
+            if weight.strip():
+                self.weights[c + 1] = self.parse_weight(c + 1, weight)
         return self.tokens
 
+    @staticmethod
+    def parse_weight(index: int, weight: str) -> float:
+        try:
+            value = float(weight)
+        except ValueError:
+            value = 0.0
+        if not (value > 0 and math.isfinite(value)):
+            logging.warning(f"Invalid weight {weight.strip()!r} for MULTI_TOKEN {index}, using 1.0")
+            return 1.0
+        return value
+
 #Dont Remove My Credit @AV_BOTz_UPDATE 
 #This Repo Is By @BOT_OWNER26 
 # For Any Kind Of Error Ask Us In Support Group @AV_SUPPORT_GROUP
@@ -1,13 +1,23 @@
 import math
+import time
 import asyncio
 import logging
 from info import *
-from typing import Dict, Union
-from web.server import work_loads
+from hashlib import sha256
+from collections import deque
+from typing import Dict, List, Optional, Tuple, Union
+from web.server import multi_clients, work_loads
+from web.server.scheduler import scheduler
 from pyrogram import Client, utils, raw
+from web.utils.cache import chunk_cache, TTLCache
+from web.utils.disk_cache import disk_cache
+from web.utils.latency import latency
+from web.utils.cdn import cdn_config, use_cdn_connections
+from web.utils.ranges import MAX_PART_SIZE
 from web.utils.file_properties import get_file_ids
+from pyrogram.crypto import aes
 from pyrogram.session import Session, Auth
-from pyrogram.errors import AuthBytesInvalid
+from pyrogram.errors import AuthBytesInvalid, CDNFileHashMismatch, FileReferenceExpired, FloodWait, RPCError
 from web.server.exceptions import FIleNotFound
 from pyrogram.file_id import FileId, FileType, ThumbnailSource
 
@@ -15,71 +25,159 @@ from pyrogram.file_id import FileId, FileType, ThumbnailSource
 #This Repo Is By @BOT_OWNER26 
 # For Any Kind Of Error Ask Us In Support Group @AV_SUPPORT_GROUP
 
+FAILOVER_ERRORS = (FloodWait, asyncio.TimeoutError, OSError)
+CDN_BLOCK_SIZE = 128 * 1024
+CDN_SESSION_TIMEOUT = 15  # seconds to connect to a CDN DC, pyrogram retries an unreachable DC forever
+CDN_REUPLOAD_ATTEMPTS = 3
+
+async def create_cdn_session(client: Client, dc_id: int) -> Session:
+    """
+    Opens a session to a telegram CDN DC, the default cdn_session_factory of ByteStreamer.
+    the address and RSA key of the DC come from the CDN config telegram announces, not from pyrogram.
+    """
+    await cdn_config.load(client, dc_id)
+    use_cdn_connections(client)
+    test_mode = await client.storage.test_mode()
+    cdn_session = Session(
+        client,
+        dc_id,
+        await Auth(client, dc_id, test_mode).create(),
+        test_mode,
+        is_media=True,
+        is_cdn=True,
+    )
+    await cdn_session.start()
+    logging.debug(f"Created CDN session for DC {dc_id}")
+    return cdn_session
+
+async def get_limited_part(
+    limiter: asyncio.Semaphore, tg_connect: "ByteStreamer", file_id: FileId, offset: int, chunk_size: int
+) -> bytes:
+    async with limiter:
+        return await tg_connect.get_part(file_id, offset, chunk_size)
+
+def _discard_result(task: asyncio.Task) -> None:
+    """Retrieves the result of an abandoned prefetch so asyncio doesn't warn about it."""
+    if not task.cancelled():
+        task.exception()
+
 class ByteStreamer:
-    def __init__(self, client: Client):
+    def __init__(self, client: Client, index: int = 0):
         """A custom class that holds the cache of a specific client and class functions.
         attributes:
             client: the client that the cache is for.
-            cached_file_ids: a dict of cached file IDs.
-            cached_file_properties: a dict of cached file properties.
+            index: the index of the client in multi_clients, its GetFile requests are reported to the scheduler.
+            cached_file_ids: a size bounded LRU cache of file IDs whose entries go stale after FILE_CACHE_TTL.
+            refreshing: the file properties that are being re-resolved right now.
+            extra_sessions: the media sessions opened per DC next to the one pyrogram keeps in client.media_sessions.
+            session_loads: the GetFile requests every busy media session is serving right now.
+            session_locks: the lock of every DC, held while a session for the DC is created.
+            growing: the DCs whose pool is opening another session right now.
+            cdn_sessions: the sessions to the telegram CDN DCs.
+            cdn_session_factory: the coroutine function (client, dc_id) that opens a CDN session.
+            cdn_redirects: the CDN redirects of the media, with the part hashes known for them.
+            cdn_failures: the media whose CDN download failed, they are fetched with GetFile until the entry expires.
         
         functions:
             generate_file_properties: returns the properties for a media of a specific message contained in Tuple.
+            refresh_file_properties: re-resolves the properties of a message, once at a time.
             generate_media_session: returns the media session for the DC that contains the media file.
+            get_media_session: returns the least busy media session of the pool for a DC, growing the pool up to MEDIA_SESSIONS.
+            add_media_session: opens another media session for a DC and adds it to the pool.
+            warm_media_session: opens the media session for a DC before it is needed.
+            check_media_session: pings the media session for a DC and reconnects it if it's dead.
             yield_file: yield a file from telegram servers for streaming.
+            failover: returns another client to resume a download with.
+            get_part: returns a single part of a file from the chunk cache or telegram servers.
+            load_part: returns a single part of a file from the disk cache or telegram servers.
+            hedged_fetch_part: fetch a single part of a file, requesting it again elsewhere if it is slow.
+            fetch_part: fetch a single part of a file from telegram servers.
+            fetch_cdn_part: fetch, decrypt and verify a single part of a file from a telegram CDN DC.
             
         This is a modified version of the <https://github.com/eyaadh/megadlbot_oss/blob/master/mega/telegram/utils/custom_download.py>
         Thanks to Eyaadh <https://github.com/eyaadh>
         """
-        self.clean_timer = 30 * 60
         self.client: Client = client
-        self.cached_file_ids: Dict[int, FileId] = {}
-        asyncio.create_task(self.clean_cache())
+        self.index = index
+        self.cached_file_ids = TTLCache(FILE_CACHE_SIZE, FILE_CACHE_TTL)
+        self.refreshing: Dict[int, asyncio.Task] = {}
+        self.session_locks: Dict[int, asyncio.Lock] = {}
+        self.growing: Dict[int, asyncio.Task] = {}
+        self.extra_sessions: Dict[int, List[Session]] = {}
+        self.session_loads: Dict[Session, int] = {}
+        self.cdn_sessions: Dict[int, Session] = {}
+        self.cdn_session_factory = create_cdn_session
+        self.cdn_redirects = TTLCache(FILE_CACHE_SIZE, FILE_CACHE_TTL)
+        self.cdn_failures = TTLCache(FILE_CACHE_SIZE, FILE_CACHE_TTL)
 
     async def get_file_properties(self, id: int) -> FileId:
         """
         Returns the properties of a media of a specific message in a FIleId class.
-        if the properties are cached, then it'll return the cached results.
+        if the properties are cached, then it'll return the cached results and refresh them in the background when stale.
         or it'll generate the properties from the Message ID and cache them.
         """
-        if id not in self.cached_file_ids:
-            await self.generate_file_properties(id)
+        cached = self.cached_file_ids.get(id)
+        if cached is None:
+            file_id = await self.generate_file_properties(id)
             logging.debug(f"Cached file properties for message with ID {id}")
-        return self.cached_file_ids[id]
+            return file_id
+        file_id, stale = cached
+        if stale:
+            logging.debug(f"Refreshing stale file properties for message with ID {id}")
+            self.refresh_file_properties(id)
+        return file_id
     
-    async def generate_file_properties(self, id: int) -> FileId:
+    async def generate_file_properties(self, id: int, use_index: bool = True) -> FileId:
         """
         Generates the properties of a media file on a specific message.
         returns ths properties in a FIleId class.
         """
-        file_id = await get_file_ids(self.client, BIN_CHANNEL, id)
+        file_id = await get_file_ids(self.client, BIN_CHANNEL, id, use_index)
         logging.debug(f"Generated file ID and Unique ID for message with ID {id}")
         if not file_id:
             logging.debug(f"Message with ID {id} not found")
             raise FIleNotFound
-        self.cached_file_ids[id] = file_id
+        self.cached_file_ids.set(id, file_id)
         logging.debug(f"Cached media message with ID {id}")
-        return self.cached_file_ids[id]
+        return file_id
+
+    def refresh_file_properties(self, id: int) -> asyncio.Task:
+        """
+        Re-resolves the properties of a media file on a specific message from telegram in the background.
+        concurrent refreshes of the same message share one task, a deleted message is dropped from the cache.
+        """
+        task = self.refreshing.get(id)
+        if task is None:
+            task = asyncio.ensure_future(self.generate_file_properties(id, use_index=False))
+            self.refreshing[id] = task
+
+            def refreshed(task: asyncio.Task) -> None:
+                self.refreshing.pop(id, None)
+                if not task.cancelled() and isinstance(task.exception(), FIleNotFound):
+                    self.cached_file_ids.pop(id)
+
+            task.add_done_callback(refreshed)
+        return task
 
 #Dont Remove My Credit @AV_BOTz_UPDATE 
 #This Repo Is By @BOT_OWNER26 
 # For Any Kind Of Error Ask Us In Support Group @AV_SUPPORT_GROUP
     
-    async def generate_media_session(self, client: Client, file_id: FileId) -> Session:
+    async def generate_media_session(self, client: Client, dc_id: int) -> Session:
         """
         Generates the media session for the DC that contains the media file.
         This is required for getting the bytes from Telegram servers.
         """
 
-        media_session = client.media_sessions.get(file_id.dc_id, None)
+        media_session = client.media_sessions.get(dc_id, None)
 
         if media_session is None:
-            if file_id.dc_id != await client.storage.dc_id():
+            if dc_id != await client.storage.dc_id():
                 media_session = Session(
                     client,
-                    file_id.dc_id,
+                    dc_id,
                     await Auth(
-                        client, file_id.dc_id, await client.storage.test_mode()
+                        client, dc_id, await client.storage.test_mode()
                     ).create(),
                     await client.storage.test_mode(),
                     is_media=True,
@@ -88,7 +186,7 @@ class ByteStreamer:
 
                 for _ in range(6):
                     exported_auth = await client.invoke(
-                        raw.functions.auth.ExportAuthorization(dc_id=file_id.dc_id)
+                        raw.functions.auth.ExportAuthorization(dc_id=dc_id)
                     )
 
                     try:
@@ -100,7 +198,7 @@ class ByteStreamer:
                         break
                     except AuthBytesInvalid:
                         logging.debug(
-                            f"Invalid authorization bytes for DC {file_id.dc_id}"
+                            f"Invalid authorization bytes for DC {dc_id}"
                         )
                         continue
                 else:
@@ -109,18 +207,110 @@ class ByteStreamer:
             else:
                 media_session = Session(
                     client,
-                    file_id.dc_id,
+                    dc_id,
                     await client.storage.auth_key(),
                     await client.storage.test_mode(),
                     is_media=True,
                 )
                 await media_session.start()
-            logging.debug(f"Created media session for DC {file_id.dc_id}")
-            client.media_sessions[file_id.dc_id] = media_session
+            logging.debug(f"Created media session for DC {dc_id}")
+            client.media_sessions[dc_id] = media_session
         else:
-            logging.debug(f"Using cached media session for DC {file_id.dc_id}")
+            logging.debug(f"Using cached media session for DC {dc_id}")
+        return media_session
+
+    def get_session_lock(self, dc_id: int) -> asyncio.Lock:
+        """
+        Returns the lock of a DC, so opening a session for one DC doesn't hold up the requests of the others.
+        """
+        lock = self.session_locks.get(dc_id)
+        if lock is None:
+            lock = self.session_locks[dc_id] = asyncio.Lock()
+        return lock
+
+    async def get_media_session(self, dc_id: int) -> Session:
+        """
+        Returns the least busy media session for a DC.
+        when every session of the DC is busy and the pool has less than MEDIA_SESSIONS sessions,
+        a new session is opened in the background with the auth key of the first one,
+        which is already authorized for the DC, and joins the pool when it's connected.
+        """
+        main_session = self.client.media_sessions.get(dc_id)
+        if main_session is None:
+            async with self.get_session_lock(dc_id):
+                main_session = await self.generate_media_session(self.client, dc_id)
+        extra_sessions = self.extra_sessions.setdefault(dc_id, [])
+        media_session = min(
+            [main_session] + extra_sessions, key=lambda s: self.session_loads.get(s, 0)
+        )
+        if (
+            self.session_loads.get(media_session, 0)
+            and len(extra_sessions) + 1 < MEDIA_SESSIONS
+            and dc_id not in self.growing
+        ):
+            task = asyncio.ensure_future(self.add_media_session(dc_id, main_session.auth_key))
+            self.growing[dc_id] = task
+            task.add_done_callback(lambda _: self.growing.pop(dc_id, None))
         return media_session
 
+    async def add_media_session(self, dc_id: int, auth_key: bytes) -> None:
+        try:
+            media_session = Session(
+                self.client,
+                dc_id,
+                auth_key,
+                await self.client.storage.test_mode(),
+                is_media=True,
+            )
+            await media_session.start()
+        except Exception:
+            logging.error(f"Failed opening another media session for DC {dc_id} of client {self.index}", exc_info=True)
+            return
+        extra_sessions = self.extra_sessions.setdefault(dc_id, [])
+        extra_sessions.append(media_session)
+        logging.debug(f"Opened media session {len(extra_sessions) + 1} for DC {dc_id}")
+
+    async def warm_media_session(self, dc_id: int) -> Session:
+        async with self.get_session_lock(dc_id):
+            return await self.generate_media_session(self.client, dc_id)
+
+    async def check_media_session(self, dc_id: int) -> None:
+        """
+        Pings the media session for a DC, a session that doesn't answer in MEDIA_KEEPALIVE_TIMEOUT
+        is stopped and replaced by a new one. dead extra sessions are dropped, the pool grows again when it's busy.
+        """
+        for extra_session in list(self.extra_sessions.get(dc_id, [])):
+            try:
+                await extra_session.send(
+                    raw.functions.Ping(ping_id=int(time.time() * 1000)),
+                    timeout=MEDIA_KEEPALIVE_TIMEOUT,
+                )
+            except Exception as e:
+                logging.warning(f"Extra media session for DC {dc_id} of client {self.index} is dead ({e!r}), dropping it")
+                self.extra_sessions[dc_id].remove(extra_session)
+                try:
+                    await extra_session.stop()
+                except Exception:
+                    logging.debug(f"Failed stopping the dead media session for DC {dc_id}", exc_info=True)
+        media_session = self.client.media_sessions.get(dc_id)
+        if media_session is not None:
+            try:
+                await media_session.send(
+                    raw.functions.Ping(ping_id=int(time.time() * 1000)),
+                    timeout=MEDIA_KEEPALIVE_TIMEOUT,
+                )
+                return
+            except Exception as e:
+                logging.warning(f"Media session for DC {dc_id} of client {self.index} is dead ({e!r}), reconnecting")
+            async with self.get_session_lock(dc_id):
+                if self.client.media_sessions.get(dc_id) is media_session:
+                    del self.client.media_sessions[dc_id]
+            try:
+                await media_session.stop()
+            except Exception:
+                logging.debug(f"Failed stopping the dead media session for DC {dc_id}", exc_info=True)
+        await self.warm_media_session(dc_id)
+
 #Dont Remove My Credit @AV_BOTz_UPDATE 
 #This Repo Is By @BOT_OWNER26 
 # For Any Kind Of Error Ask Us In Support Group @AV_SUPPORT_GROUP
@@ -154,7 +344,9 @@ class ByteStreamer:
                 local_id=file_id.local_id,
                 big=file_id.thumbnail_source == ThumbnailSource.CHAT_PHOTO_BIG,
             )
-        elif file_type == FileType.PHOTO:
+        elif file_type == FileType.PHOTO or (
+            file_type == FileType.THUMBNAIL and file_id.thumbnail_file_type == FileType.PHOTO
+        ):
             location = raw.types.InputPhotoFileLocation(
                 id=file_id.media_id,
                 access_hash=file_id.access_hash,
@@ -178,72 +370,363 @@ class ByteStreamer:
         self,
         file_id: FileId,
         index: int,
-        offset: int,
+        parts: List[Tuple[int, int]],
         first_part_cut: int,
         last_part_cut: int,
-        part_count: int,
-        chunk_size: int,
+        stripes: Optional[List[Tuple[int, "ByteStreamer", FileId]]] = None,
+        download=None,
     ) -> Union[str, None]:
         """
-        Custom generator that yields the bytes of the media file.
+        Custom generator that yields the bytes of the media file as memoryview slices of the fetched parts.
+        parts are the (offset, limit) GetFile requests planned for the byte range, they can differ in size.
+        if stripes (index, ByteStreamer, FileId) are given, the parts are fetched round robin from them.
+        when a client fails a part with a FloodWait, a timeout or a dropped connection, the download resumes
+        from that part on another client, up to FAILOVER_ATTEMPTS times.
+        a download that can't be finished raises instead of ending early, so the response is aborted
+        rather than left shorter than its Content-Length.
+        if the DownloadSession of sibling connections is given, it holds the load of the first client
+        and its limiter caps the parts all the siblings have in flight.
         Modded from <https://github.com/eyaadh/megadlbot_oss/blob/master/mega/telegram/utils/custom_download.py#L20>
         Thanks to Eyaadh <https://github.com/eyaadh>
         """
-        client = self.client
-        work_loads[index] += 1
-        logging.debug(f"Starting to yielding file with client {index}.")
-        media_session = await self.generate_media_session(client, file_id)
+        stripes = list(stripes) if stripes else [(index, self, file_id)]
+        # the download session holds the load of the first stripe for all its connections
+        first_counted = 0 if download is None else 1
+        for stripe_index, _, _ in stripes[first_counted:]:
+            work_loads[stripe_index] += 1
+        logging.debug(f"Starting to yielding file with clients {[s[0] for s in stripes]}.")
 
         current_part = 1
-        location = await self.get_location(file_id)
+        part_count = len(parts)
+        window = max(PREFETCH_WINDOW, len(stripes))
+        pending = deque()
+        failed = set()
+        failovers = 0
+
+        def prefetch():
+            while len(pending) < window and current_part + len(pending) <= part_count:
+                part = current_part + len(pending)
+                _, streamer, stripe_file_id = stripes[(part - 1) % len(stripes)]
+                part_offset, limit = parts[part - 1]
+                if download is None:
+                    fetch = streamer.get_part(stripe_file_id, part_offset, limit)
+                else:
+                    fetch = get_limited_part(download.limiter, streamer, stripe_file_id, part_offset, limit)
+                pending.append(asyncio.ensure_future(fetch))
 
         try:
-            r = await media_session.send(
-                raw.functions.upload.GetFile(
-                    location=location, offset=offset, limit=chunk_size
-                ),
-            )
-            if isinstance(r, raw.types.upload.File):
-                while True:
-                    chunk = r.bytes
-                    if not chunk:
-                        break
-                    elif part_count == 1:
-                        yield chunk[first_part_cut:last_part_cut]
-                    elif current_part == 1:
-                        yield chunk[first_part_cut:]
-                    elif current_part == part_count:
-                        yield chunk[:last_part_cut]
+            prefetch()
+            while pending:
+                try:
+                    chunk = await pending.popleft()
+                except FAILOVER_ERRORS as e:
+                    stripe = (current_part - 1) % len(stripes)
+                    failed_index = stripes[stripe][0]
+                    if failovers >= FAILOVER_ATTEMPTS:
+                        logging.error(f"Client {failed_index} failed part {current_part} ({e!r}), giving up after {failovers} failovers")
+                        raise
+                    failovers += 1
+                    failed.add(failed_index)
+                    for task in pending:
+                        task.cancel()
+                        task.add_done_callback(_discard_result)
+                    pending.clear()
+                    try:
+                        stripes[stripe] = await self.failover(stripes[stripe][2], failed)
+                    except Exception as failover_error:
+                        logging.error(f"Client {failed_index} failed part {current_part} ({e!r}), no client could resume it ({failover_error!r})")
+                        raise failover_error from e
+                    if stripe < first_counted:
+                        download.move(stripes[stripe][0])
                     else:
-                        yield chunk
+                        work_loads[failed_index] -= 1
+                        work_loads[stripes[stripe][0]] += 1
+                    logging.warning(
+                        f"Client {failed_index} failed part {current_part} ({e!r}), resuming with client {stripes[stripe][0]}"
+                    )
+                    prefetch()
+                    continue
+                if not chunk:
+                    raise ValueError(f"Got an empty part {current_part} of {part_count} at offset {parts[current_part - 1][0]}")
+                chunk = memoryview(chunk)
+                if part_count == 1:
+                    yield chunk[first_part_cut:last_part_cut]
+                elif current_part == 1:
+                    yield chunk[first_part_cut:]
+                elif current_part == part_count:
+                    yield chunk[:last_part_cut]
+                else:
+                    yield chunk
 
-                    current_part += 1
-                    offset += chunk_size
+                current_part += 1
+                if current_part > part_count:
+                    break
+                prefetch()
+        finally:
+            for task in pending:
+                task.cancel()
+                task.add_done_callback(_discard_result)
+            logging.debug(f"Finished yielding file with {current_part} parts.")
+            for stripe_index, _, _ in stripes[first_counted:]:
+                work_loads[stripe_index] -= 1
 
-                    if current_part > part_count:
-                        break
+    async def failover(self, file_id: FileId, failed: set) -> Tuple[int, "ByteStreamer", FileId]:
+        """
+        Returns the stripe (index, ByteStreamer, FileId) of the best client that didn't fail the download yet,
+        with the file properties of that client.
+        """
+        index = scheduler.pick(file_id.dc_id, exclude=failed)
+        tg_connect = get_streamer(index)
+        return index, tg_connect, await tg_connect.get_file_properties(file_id.message_id)
+
+    async def get_part(self, file_id: FileId, offset: int, chunk_size: int) -> bytes:
+        """
+        Returns a single part of the media file from the shared chunk cache,
+        or fetches it from telegram servers if it isn't cached.
+        a small part is cut from the cached 1 MiB part that contains it if there is one.
+        """
+        if chunk_size < MAX_PART_SIZE:
+            aligned_offset = offset - offset % MAX_PART_SIZE
+            chunk = chunk_cache.peek((file_id.media_id, aligned_offset, MAX_PART_SIZE))
+            if chunk is not None:
+                return chunk[offset - aligned_offset:offset - aligned_offset + chunk_size]
+        return await chunk_cache.get(
+            (file_id.media_id, offset, chunk_size),
+            lambda: self.load_part(file_id, offset, chunk_size),
+        )
+
+    async def load_part(self, file_id: FileId, offset: int, chunk_size: int) -> bytes:
+        """
+        Reads a single part of the media file from the disk cache,
+        or fetches it from telegram servers and writes it to the disk cache.
+        """
+        file_size = getattr(file_id, "file_size", 0)
+        if disk_cache is None or not file_size:
+            return await self.hedged_fetch_part(file_id, offset, chunk_size)
+        chunk = await disk_cache.read(file_id.media_id, offset, min(chunk_size, file_size - offset))
+        if chunk:
+            return chunk
+        chunk = await self.hedged_fetch_part(file_id, offset, chunk_size)
+        disk_cache.put_nowait(file_id.media_id, file_size, offset, chunk)
+        return chunk
 
+    async def hedged_fetch_part(self, file_id: FileId, offset: int, chunk_size: int) -> bytes:
+        """
+        Fetches a single part of the media file, a part that doesn't arrive before the latency deadline
+        is counted as a stall. if HEDGE_REQUESTS is on, the stalled part is requested again on another
+        client or media session, the first answer is returned and the other request is cancelled.
+        """
+        tasks = [asyncio.ensure_future(self.fetch_part(file_id, offset, chunk_size))]
+        try:
+            try:
+                return await asyncio.wait_for(asyncio.shield(tasks[0]), latency.deadline())
+            except asyncio.TimeoutError:
+                # the request itself can time out before the deadline
+                if tasks[0].done():
+                    return tasks[0].result()
+            latency.stalls += 1
+            if not HEDGE_REQUESTS:
+                return await tasks[0]
+            latency.hedges += 1
+            logging.debug(f"Part at {offset} of message with ID {file_id.message_id} is slow, hedging it")
+            tasks.append(asyncio.ensure_future(self.hedge_part(file_id, offset, chunk_size)))
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if not task.cancelled() and task.exception() is None:
+                        if task is tasks[1]:
+                            latency.hedge_wins += 1
+                        return task.result()
+            return tasks[0].result()
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+                    task.add_done_callback(_discard_result)
+
+    async def hedge_part(self, file_id: FileId, offset: int, chunk_size: int) -> bytes:
+        """
+        Fetches a single part of the media file again, with the best other client if there is one,
+        or else with the least busy media session of this client.
+        """
+        index = scheduler.pick(file_id.dc_id, exclude=[self.index])
+        if index != self.index:
+            tg_connect = get_streamer(index)
+            return await tg_connect.fetch_part(
+                await tg_connect.get_file_properties(file_id.message_id), offset, chunk_size
+            )
+        return await self.fetch_part(file_id, offset, chunk_size)
+
+    async def fetch_part(self, file_id: FileId, offset: int, chunk_size: int, cdn: bool = True) -> bytes:
+        """
+        Fetches a single part of the media file from telegram servers.
+        returns empty bytes if telegram didn't answer with the file bytes.
+        cdn=False never uses a CDN redirect, for thumbnails that share the media_id of their media.
+        """
+        media_session = await self.get_media_session(file_id.dc_id)
+        location = await self.get_location(file_id)
+        chunk = b""
+        started = time.monotonic()
+        scheduler.started(self.index, chunk_size)
+        self.session_loads[media_session] = self.session_loads.get(media_session, 0) + 1
+        try:
+            # the CDN checks its parts in 128 KiB blocks, smaller parts are always fetched with GetFile
+            cdn_supported = (
+                cdn and CDN_DOWNLOAD and chunk_size >= CDN_BLOCK_SIZE and self.cdn_failures.get(file_id.media_id) is None
+            )
+            cached = self.cdn_redirects.get(file_id.media_id) if cdn_supported else None
+            if cached is not None and not cached[1]:
+                r = cached[0][0]
+            else:
+                try:
+                    r = await media_session.send(
+                        raw.functions.upload.GetFile(
+                            location=location, offset=offset, limit=chunk_size, cdn_supported=cdn_supported
+                        ),
+                    )
+                except FileReferenceExpired:
+                    logging.debug(f"File reference expired for message with ID {file_id.message_id}")
+                    fresh_file_id = await asyncio.shield(self.refresh_file_properties(file_id.message_id))
+                    file_id.file_reference = fresh_file_id.file_reference
+                    location = await self.get_location(file_id)
                     r = await media_session.send(
                         raw.functions.upload.GetFile(
-                            location=location, offset=offset, limit=chunk_size
+                            location=location, offset=offset, limit=chunk_size, cdn_supported=cdn_supported
                         ),
                     )
-        except (TimeoutError, AttributeError):
-            pass
+            if isinstance(r, raw.types.upload.FileCdnRedirect):
+                try:
+                    chunk = await self.fetch_cdn_part(media_session, file_id, r, offset, chunk_size)
+                except Exception as e:
+                    logging.warning(f"CDN download of message with ID {file_id.message_id} failed ({e!r}), using GetFile")
+                    self.cdn_redirects.pop(file_id.media_id)
+                    self.cdn_failures.set(file_id.media_id, True)
+                    r = await media_session.send(
+                        raw.functions.upload.GetFile(location=location, offset=offset, limit=chunk_size),
+                    )
+                else:
+                    latency.record(time.monotonic() - started)
+                    return chunk
+            if isinstance(r, raw.types.upload.File):
+                chunk = r.bytes
+                latency.record(time.monotonic() - started)
+            return chunk
+        except FloodWait as e:
+            scheduler.flood_wait(self.index, e.value)
+            raise
         finally:
-            logging.debug("Finished yielding file with {current_part} parts.")
-            work_loads[index] -= 1
+            loads = self.session_loads.pop(media_session) - 1
+            if loads:
+                self.session_loads[media_session] = loads
+            scheduler.finished(self.index, chunk_size, len(chunk), time.monotonic() - started)
 
-    
-    async def clean_cache(self) -> None:
+#Dont Remove My Credit @AV_BOTz_UPDATE 
+#This Repo Is By @BOT_OWNER26 
+# For Any Kind Of Error Ask Us In Support Group @AV_SUPPORT_GROUP
+
+    async def get_cdn_session(self, dc_id: int) -> Session:
         """
-        function to clean the cache to reduce memory usage
+        Returns the session to a CDN DC, opening it under the lock of that DC only,
+        and giving up after CDN_SESSION_TIMEOUT seconds.
         """
-        while True:
-            await asyncio.sleep(self.clean_timer)
-            self.cached_file_ids.clear()
-            logging.debug("Cleaned the cache")
-            
+        cdn_session = self.cdn_sessions.get(dc_id)
+        if cdn_session is None:
+            async with self.get_session_lock(dc_id):
+                cdn_session = self.cdn_sessions.get(dc_id)
+                if cdn_session is None:
+                    cdn_session = await asyncio.wait_for(
+                        self.cdn_session_factory(self.client, dc_id), CDN_SESSION_TIMEOUT
+                    )
+                    self.cdn_sessions[dc_id] = cdn_session
+        return cdn_session
+
+    async def fetch_cdn_part(
+        self,
+        media_session: Session,
+        file_id: FileId,
+        redirect: raw.types.upload.FileCdnRedirect,
+        offset: int,
+        chunk_size: int,
+    ) -> bytes:
+        """
+        Fetches a single part of the media file from the CDN DC telegram redirected to.
+        the part is decrypted with the AES-256-CTR key of the redirect and checked against the sha256 hashes
+        that telegram sends for every block of the file, see <https://core.telegram.org/cdn>.
+        """
+        cdn_session = await self.get_cdn_session(redirect.dc_id)
+        cached = self.cdn_redirects.get(file_id.media_id)
+        if cached is None or cached[0][0] is not redirect:
+            hashes = {h.offset: h for h in redirect.file_hashes}
+            self.cdn_redirects.set(file_id.media_id, (redirect, hashes))
+        else:
+            hashes = cached[0][1]
+        for attempt in range(CDN_REUPLOAD_ATTEMPTS + 1):
+            r = await cdn_session.send(
+                raw.functions.upload.GetCdnFile(
+                    file_token=redirect.file_token, offset=offset, limit=chunk_size
+                ),
+            )
+            if not isinstance(r, raw.types.upload.CdnFileReuploadNeeded):
+                break
+            if attempt == CDN_REUPLOAD_ATTEMPTS:
+                raise ValueError(f"Message with ID {file_id.message_id} still needs a CDN reupload")
+            logging.debug(f"Asking telegram to reupload message with ID {file_id.message_id} to the CDN")
+            for h in await media_session.send(
+                raw.functions.upload.ReuploadCdnFile(
+                    file_token=redirect.file_token, request_token=r.request_token
+                ),
+            ):
+                hashes[h.offset] = h
+
+        chunk = aes.ctr256_decrypt(
+            r.bytes,
+            redirect.encryption_key,
+            bytearray(redirect.encryption_iv[:-4] + (offset // 16).to_bytes(4, "big")),
+        )
+        block_offset = offset
+        while block_offset < offset + len(chunk):
+            if block_offset not in hashes:
+                for h in await media_session.send(
+                    raw.functions.upload.GetCdnFileHashes(
+                        file_token=redirect.file_token, offset=block_offset
+                    ),
+                ):
+                    hashes[h.offset] = h
+            h = hashes.get(block_offset)
+            if h is None:
+                raise CDNFileHashMismatch(f"No hash for offset {block_offset}")
+            block = chunk[block_offset - offset:block_offset - offset + h.limit]
+            CDNFileHashMismatch.check(h.hash == sha256(block).digest(), "h.hash == sha256(block).digest()")
+            block_offset += h.limit
+        return chunk
+
+
+class_cache = {}
+
+def get_streamer(index: int) -> ByteStreamer:
+    """
+    Returns the ByteStreamer of the client with the given index, creating it on first use.
+    """
+    client = multi_clients[index]
+    if client in class_cache:
+        logging.debug(f"Using cached ByteStreamer object for client {index}")
+        return class_cache[client]
+    logging.debug(f"Creating new ByteStreamer object for client {index}")
+    tg_connect = ByteStreamer(client, index)
+    class_cache[client] = tg_connect
+    return tg_connect
+
+def get_cached_dc_id(id: int) -> Optional[int]:
+    """
+    Returns the DC of the media of a message if any client has its properties cached.
+    """
+    for tg_connect in class_cache.values():
+        cached = tg_connect.cached_file_ids.get(id)
+        if cached is not None:
+            return cached[0].dc_id
+    return None
+
 #Dont Remove My Credit @AV_BOTz_UPDATE 
 #This Repo Is By @BOT_OWNER26 
 # For Any Kind Of Error Ask Us In Support Group @AV_SUPPORT_GROUP
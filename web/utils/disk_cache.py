@@ -0,0 +1,325 @@
+import os
+import time
+import asyncio
+import sqlite3
+import logging
+from info import *
+from bisect import bisect_right
+from aiohttp import web
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Set, Tuple
+
+#Dont Remove My Credit @AV_BOTz_UPDATE 
+#This Repo Is By @BOT_OWNER26 
+# For Any Kind Of Error Ask Us In Support Group @AV_SUPPORT_GROUP
+
+class DiskCache:
+    def __init__(self, path: str, max_bytes: int, backlog_bytes: int):
+        """An on-disk cache for the parts fetched from telegram.
+        every media is kept in one sparse file at the real offsets of its parts, and an sqlite index
+        records which byte ranges of it are on disk. a part is only added to the index after its bytes
+        are flushed to the disk, so the index never points at data that was lost in a crash.
+        the in memory view is only used from the event loop, the writer thread only does the disk I/O,
+        so the event loop never waits for the disk.
+        attributes:
+            path: the directory of the cached files and the index.
+            max_bytes: the total size of the cached parts, least recently used media are evicted first.
+            backlog_bytes: the bytes that may wait for the writer, parts that don't fit are dropped.
+            media: the cached media and their cached bytes, in least recently used order.
+            ranges: the sorted and merged (start, end) byte ranges cached for every media.
+            pending: the bytes waiting for the writer.
+            queued: the (media_id, offset, length) parts waiting for the writer.
+            writing: the number of parts of every media waiting for the writer.
+            generation: counts the evictions of the media that are being written, to forget their writes.
+
+        functions:
+            covers: returns True if a byte range of a media is fully on disk.
+            read: reads a cached part from the disk.
+            put: writes a part to the disk in the background writer thread.
+            put_nowait: queues a part for the writer without waiting for it.
+            response: returns a response that sends a cached byte range with sendfile.
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backlog_bytes = backlog_bytes
+        self.writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="disk_cache")
+        self.size = 0
+        self.media: "OrderedDict[int, int]" = OrderedDict()
+        self.ranges: Dict[int, List[Tuple[int, int]]] = {}
+        self.touched: Dict[int, float] = {}
+        self.pending = 0
+        self.queued: Set[Tuple[int, int, int]] = set()
+        self.writing: Dict[int, int] = {}
+        self.generation: Dict[int, int] = {}
+        self.tasks: Set[asyncio.Task] = set()
+        self.dropped = 0
+        os.makedirs(path, exist_ok=True)
+        self.db = sqlite3.connect(os.path.join(path, "index.db"), check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS media (media_id INTEGER PRIMARY KEY, file_size INTEGER, accessed REAL)"
+        )
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS parts (media_id INTEGER, offset INTEGER, length INTEGER, "
+            "PRIMARY KEY (media_id, offset, length))"
+        )
+        self.db.commit()
+        self.load()
+
+    def file_path(self, media_id: int) -> str:
+        return os.path.join(self.path, str(media_id))
+
+    def load(self) -> None:
+        """
+        Rebuilds the in memory view of the cache from the index,
+        and removes the files that the index doesn't know about.
+        """
+        known = set()
+        for media_id, in self.db.execute("SELECT media_id FROM media ORDER BY accessed"):
+            if not os.path.exists(self.file_path(media_id)):
+                self.db.execute("DELETE FROM parts WHERE media_id = ?", (media_id,))
+                self.db.execute("DELETE FROM media WHERE media_id = ?", (media_id,))
+                continue
+            known.add(str(media_id))
+            self.media[media_id] = 0
+        for media_id, offset, length in self.db.execute("SELECT media_id, offset, length FROM parts"):
+            if media_id in self.media:
+                added = self.add_range(media_id, offset, offset + length)
+                self.media[media_id] += added
+                self.size += added
+        self.db.commit()
+        for name in os.listdir(self.path):
+            if name.isdigit() and name not in known:
+                os.remove(os.path.join(self.path, name))
+        logging.info(f"Disk cache loaded {len(self.media)} files, {self.size} bytes")
+
+#Dont Remove My Credit @AV_BOTz_UPDATE 
+#This Repo Is By @BOT_OWNER26 
+# For Any Kind Of Error Ask Us In Support Group @AV_SUPPORT_GROUP
+
+    def add_range(self, media_id: int, start: int, end: int) -> int:
+        """
+        Merges the byte range [start, end) into the cached ranges of a media.
+        returns the number of bytes that weren't cached before.
+        """
+        ranges = self.ranges.setdefault(media_id, [])
+        added = end - start
+        merged = []
+        for s, e in ranges:
+            if e < start or s > end:
+                merged.append((s, e))
+                continue
+            added -= max(0, min(e, end) - max(s, start))
+            start, end = min(s, start), max(e, end)
+        merged.append((start, end))
+        merged.sort()
+        self.ranges[media_id] = merged
+        return added
+
+    def covers(self, media_id: int, start: int, end: int) -> bool:
+        """
+        Returns True if the bytes from start to end (inclusive) of a media are on disk.
+        """
+        ranges = self.ranges.get(media_id)
+        if not ranges:
+            return False
+        i = bisect_right(ranges, (start, float("inf"))) - 1
+        if i < 0 or ranges[i][1] <= end:
+            return False
+        self.touch(media_id)
+        return True
+
+    def touch(self, media_id: int) -> None:
+        self.media.move_to_end(media_id)
+        now = time.time()
+        if now - self.touched.get(media_id, 0) > 60:
+            self.touched[media_id] = now
+            self.writer.submit(self._touch, media_id, now)
+
+    def _touch(self, media_id: int, accessed: float) -> None:
+        self.db.execute("UPDATE media SET accessed = ? WHERE media_id = ?", (accessed, media_id))
+        self.db.commit()
+
+    async def read(self, media_id: int, offset: int, length: int) -> Optional[bytes]:
+        """
+        Returns the cached part of a media, or None if it isn't fully on disk.
+        """
+        if length <= 0 or not self.covers(media_id, offset, offset + length - 1):
+            return None
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                None, self._read, media_id, offset, length
+            )
+        except OSError:
+            logging.debug(f"Cached file of media {media_id} is gone")
+            return None
+
+    def _read(self, media_id: int, offset: int, length: int) -> bytes:
+        fd = os.open(self.file_path(media_id), os.O_RDONLY)
+        try:
+            return os.pread(fd, length, offset)
+        finally:
+            os.close(fd)
+
+#Dont Remove My Credit @AV_BOTz_UPDATE 
+#This Repo Is By @BOT_OWNER26 
+# For Any Kind Of Error Ask Us In Support Group @AV_SUPPORT_GROUP
+
+    async def put(self, media_id: int, file_size: int, offset: int, chunk: bytes) -> None:
+        """
+        Writes a part of a media to the disk, then evicts the least recently used media if needed.
+        """
+        if self.reserve(media_id, offset, chunk):
+            await self._put(media_id, file_size, offset, chunk)
+
+    def put_nowait(self, media_id: int, file_size: int, offset: int, chunk: bytes) -> None:
+        """
+        Queues a part of a media for the writer, the part is dropped if the backlog is full.
+        """
+        if self.reserve(media_id, offset, chunk):
+            task = asyncio.ensure_future(self._put(media_id, file_size, offset, chunk))
+            self.tasks.add(task)
+            task.add_done_callback(self.tasks.discard)
+
+    def reserve(self, media_id: int, offset: int, chunk: bytes) -> bool:
+        """
+        Returns True and counts the part in the backlog if it should be written.
+        """
+        if not chunk or len(chunk) > self.max_bytes:
+            return False
+        key = (media_id, offset, len(chunk))
+        if key in self.queued or self.covers(media_id, offset, offset + len(chunk) - 1):
+            return False
+        if self.pending + len(chunk) > self.backlog_bytes:
+            self.dropped += 1
+            logging.debug(f"Disk cache backlog is full, dropping part at {offset} of media {media_id}")
+            return False
+        self.queued.add(key)
+        self.pending += len(chunk)
+        self.writing[media_id] = self.writing.get(media_id, 0) + 1
+        return True
+
+    async def _put(self, media_id: int, file_size: int, offset: int, chunk: bytes) -> None:
+        generation = self.generation.get(media_id, 0)
+        written = False
+        try:
+            await asyncio.get_running_loop().run_in_executor(
+                self.writer, self._write, media_id, file_size, offset, chunk
+            )
+            written = True
+        except OSError:
+            logging.error(f"Failed writing media {media_id} to the disk cache", exc_info=True)
+        finally:
+            # a media evicted while its part was queued is removed from the disk after the part is written
+            evicted = self.generation.get(media_id, 0) != generation
+            self.queued.discard((media_id, offset, len(chunk)))
+            self.pending -= len(chunk)
+            writing = self.writing.pop(media_id) - 1
+            if writing:
+                self.writing[media_id] = writing
+            else:
+                self.generation.pop(media_id, None)
+        if not written or evicted:
+            return
+        self.touched[media_id] = time.time()
+        added = self.add_range(media_id, offset, offset + len(chunk))
+        self.media[media_id] = self.media.get(media_id, 0) + added
+        self.media.move_to_end(media_id)
+        self.size += added
+        self.evict()
+
+    def _write(self, media_id: int, file_size: int, offset: int, chunk: bytes) -> None:
+        fd = os.open(self.file_path(media_id), os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            if os.fstat(fd).st_size != file_size:
+                os.ftruncate(fd, file_size)
+            os.pwrite(fd, chunk, offset)
+            os.fdatasync(fd)
+        finally:
+            os.close(fd)
+        self.db.execute(
+            "INSERT OR REPLACE INTO media (media_id, file_size, accessed) VALUES (?, ?, ?)",
+            (media_id, file_size, time.time()),
+        )
+        self.db.execute(
+            "INSERT OR IGNORE INTO parts (media_id, offset, length) VALUES (?, ?, ?)",
+            (media_id, offset, len(chunk)),
+        )
+        self.db.commit()
+
+    def evict(self) -> None:
+        evicted = []
+        while self.size > self.max_bytes and len(self.media) > 1:
+            media_id, size = self.media.popitem(last=False)
+            self.size -= size
+            self.ranges.pop(media_id, None)
+            self.touched.pop(media_id, None)
+            if media_id in self.writing:
+                self.generation[media_id] = self.generation.get(media_id, 0) + 1
+            evicted.append(media_id)
+            logging.debug(f"Evicted media {media_id} ({size} bytes) from the disk cache")
+        if evicted:
+            self.writer.submit(self._remove, evicted)
+
+    def _remove(self, media_ids: List[int]) -> None:
+        for media_id in media_ids:
+            self.db.execute("DELETE FROM parts WHERE media_id = ?", (media_id,))
+            self.db.execute("DELETE FROM media WHERE media_id = ?", (media_id,))
+            try:
+                os.remove(self.file_path(media_id))
+            except FileNotFoundError:
+                pass
+        self.db.commit()
+
+    def stats(self) -> dict:
+        return {"files": len(self.media), "size": self.size, "pending": self.pending, "dropped": self.dropped}
+
+    def response(self, media_id: int, offset: int, count: int, **kwargs) -> "DiskCacheResponse":
+        return DiskCacheResponse(self.file_path(media_id), offset, count, **kwargs)
+
+#Dont Remove My Credit @AV_BOTz_UPDATE 
+#This Repo Is By @BOT_OWNER26 
+# For Any Kind Of Error Ask Us In Support Group @AV_SUPPORT_GROUP
+
+class DiskCacheResponse(web.StreamResponse):
+    """
+    A response that sends a byte range of a cached file straight from the page cache with sendfile.
+    """
+
+    def __init__(self, path: str, offset: int, count: int, **kwargs):
+        super().__init__(**kwargs)
+        self.path = path
+        self.offset = offset
+        self.count = count
+
+    async def prepare(self, request: web.BaseRequest):
+        writer = await super().prepare(request)
+        if request.method == "HEAD":
+            return writer
+        loop = asyncio.get_running_loop()
+        transport = request.transport
+        if transport is None:
+            raise ConnectionResetError("Connection lost")
+        with open(self.path, "rb") as f:
+            try:
+                await loop.sendfile(transport, f, self.offset, self.count)
+            except NotImplementedError:
+                f.seek(self.offset)
+                count = self.count
+                while count > 0:
+                    chunk = await loop.run_in_executor(None, f.read, min(count, 1024 * 1024))
+                    if not chunk:
+                        break
+                    await writer.write(chunk)
+                    count -= len(chunk)
+        await super().write_eof()
+        return writer
+
+#Dont Remove My Credit @AV_BOTz_UPDATE 
+#This Repo Is By @BOT_OWNER26 
+# For Any Kind Of Error Ask Us In Support Group @AV_SUPPORT_GROUP
+
+disk_cache = DiskCache(
+    DISK_CACHE_DIR, DISK_CACHE_SIZE * 1024 * 1024, DISK_CACHE_BACKLOG * 1024 * 1024
+) if DISK_CACHE_DIR else None
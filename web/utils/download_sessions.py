@@ -0,0 +1,103 @@
+import asyncio
+import logging
+from info import *
+from aiohttp import web
+from typing import Dict, Optional, Tuple
+from web.server import work_loads
+
+#Dont Remove My Credit @AV_BOTz_UPDATE 
+#This Repo Is By @BOT_OWNER26 
+# For Any Kind Of Error Ask Us In Support Group @AV_SUPPORT_GROUP
+
+def get_client_ip(request: web.Request) -> str:
+    """
+    Returns the IP of the user. X-Forwarded-For is only read when the request comes from one of TRUSTED_PROXIES
+    or through the heroku router (which appends the address it saw), the nearest address in it that isn't a
+    trusted proxy is the user, any other client could send a new one on every connection.
+    """
+    ip = request.remote or ""
+    if ip not in TRUSTED_PROXIES and not ON_HEROKU:
+        return ip
+    for forwarded in reversed(request.headers.get("X-Forwarded-For", "").split(",")):
+        forwarded = forwarded.strip()
+        if forwarded and forwarded not in TRUSTED_PROXIES:
+            return forwarded
+    return ip
+
+class DownloadSession:
+    def __init__(self, key: Tuple[str, int], index: int):
+        """The shared download of one file by the parallel range connections of one user.
+        attributes:
+            key: the (IP, message id) of the download.
+            index: the client that serves every connection of the download, it counts as one load.
+            connections: the connections that are streaming right now.
+            limiter: caps the parts all the connections have in flight at FILE_PARTS_LIMIT.
+            expiry: the timer that ends the session AGGREGATION_WINDOW seconds after its last connection.
+        """
+        self.key = key
+        self.index = index
+        self.connections = 0
+        self.limiter = asyncio.Semaphore(FILE_PARTS_LIMIT)
+        self.expiry: Optional[asyncio.TimerHandle] = None
+        work_loads[index] += 1
+
+    def move(self, index: int) -> None:
+        """
+        Moves the download to another client, after its client failed.
+        """
+        work_loads[self.index] -= 1
+        work_loads[index] += 1
+        self.index = index
+
+    def close(self) -> None:
+        work_loads[self.index] -= 1
+
+class DownloadSessions:
+    def __init__(self, window: float):
+        """The download sessions of the users, so download managers that open many range connections
+        to one file are served by one client with one cap on the parts in flight.
+        attributes:
+            window: the seconds a session waits for another connection after its last one ended, 0 = off.
+            sessions: the running sessions keyed by (IP, message id).
+        """
+        self.window = window
+        self.sessions: Dict[Tuple[str, int], DownloadSession] = {}
+
+    def get(self, ip: str, id: int) -> Optional[DownloadSession]:
+        return self.sessions.get((ip, id))
+
+    def join(self, ip: str, id: int, index: int) -> Optional[DownloadSession]:
+        """
+        Returns the session of the user for a file, starting one on the given client if there is none.
+        """
+        if self.window <= 0:
+            return None
+        session = self.sessions.get((ip, id))
+        if session is None:
+            session = self.sessions[(ip, id)] = DownloadSession((ip, id), index)
+        elif session.connections:
+            logging.debug(f"Connection {session.connections + 1} of {ip} joined the download of message with ID {id}")
+        if session.expiry is not None:
+            session.expiry.cancel()
+            session.expiry = None
+        session.connections += 1
+        return session
+
+    def leave(self, session: Optional[DownloadSession]) -> None:
+        if session is None:
+            return
+        session.connections -= 1
+        if not session.connections:
+            session.expiry = asyncio.get_running_loop().call_later(self.window, self.expire, session)
+
+    def expire(self, session: DownloadSession) -> None:
+        if session.connections or self.sessions.get(session.key) is not session:
+            return
+        del self.sessions[session.key]
+        session.close()
+
+#Dont Remove My Credit @AV_BOTz_UPDATE 
+#This Repo Is By @BOT_OWNER26 
+# For Any Kind Of Error Ask Us In Support Group @AV_SUPPORT_GROUP
+
+download_sessions = DownloadSessions(AGGREGATION_WINDOW)
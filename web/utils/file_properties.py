@@ -1,5 +1,9 @@
+import asyncio
+import logging
+from info import *
 from pyrogram import Client
-from typing import Any, Optional
+from database.users_db import db
+from typing import Any, Dict, List, Optional
 from pyrogram.types import Message
 from pyrogram.file_id import FileId
 from pyrogram.raw.types.messages import Messages
@@ -23,8 +27,72 @@ async def parse_file_unique_id(message: "Messages") -> Optional[str]:
 #This Repo Is By @BOT_OWNER26 
 # For Any Kind Of Error Ask Us In Support Group @AV_SUPPORT_GROUP
 
-async def get_file_ids(client: Client, chat_id: int, id: int) -> Optional[FileId]:
-    message = await client.get_messages(chat_id, id)
+class MessageBatcher:
+    def __init__(self, client: Client, chat_id: int):
+        """Collects the messages requested from one chat within BATCH_WINDOW milliseconds,
+        and resolves them with a single get_messages call of up to 200 ids.
+        attributes:
+            client: the client that resolves the messages.
+            chat_id: the chat the messages are in.
+            pending: the futures waiting for every requested message id.
+        """
+        self.client = client
+        self.chat_id = chat_id
+        self.pending: Dict[int, List[asyncio.Future]] = {}
+        self.timer: Optional[asyncio.TimerHandle] = None
+
+    async def get(self, id: int) -> "Message":
+        future = asyncio.get_running_loop().create_future()
+        self.pending.setdefault(id, []).append(future)
+        if len(self.pending) >= 200:
+            self.flush()
+        elif self.timer is None:
+            self.timer = asyncio.get_running_loop().call_later(BATCH_WINDOW / 1000, self.flush)
+        return await future
+
+    def flush(self) -> None:
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+        pending, self.pending = self.pending, {}
+        asyncio.ensure_future(self.resolve(pending))
+
+    async def resolve(self, pending: Dict[int, List[asyncio.Future]]) -> None:
+        ids = list(pending)
+        logging.debug(f"Resolving {len(ids)} messages of {self.chat_id} in one call")
+        try:
+            messages = await self.client.get_messages(self.chat_id, ids)
+        except Exception as e:
+            for futures in pending.values():
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(e)
+            return
+        for id, message in zip(ids, messages):
+            for future in pending[id]:
+                if not future.done():
+                    future.set_result(message)
+
+message_batchers: Dict[tuple, MessageBatcher] = {}
+
+async def get_message(client: Client, chat_id: int, id: int) -> "Message":
+    if BATCH_WINDOW <= 0:
+        return await client.get_messages(chat_id, id)
+    batcher = message_batchers.get((client, chat_id))
+    if batcher is None:
+        batcher = message_batchers[(client, chat_id)] = MessageBatcher(client, chat_id)
+    return await batcher.get(id)
+
+#Dont Remove My Credit @AV_BOTz_UPDATE 
+#This Repo Is By @BOT_OWNER26 
+# For Any Kind Of Error Ask Us In Support Group @AV_SUPPORT_GROUP
+
+async def get_file_ids(client: Client, chat_id: int, id: int, use_index: bool = True) -> Optional[FileId]:
+    if use_index:
+        file_id = await get_indexed_file_ids(client, id)
+        if file_id:
+            return file_id
+    message = await get_message(client, chat_id, id)
     if message.empty:
         raise FIleNotFound
     media = get_media_from_message(message)
@@ -34,8 +102,49 @@ async def get_file_ids(client: Client, chat_id: int, id: int) -> Optional[FileId
     setattr(file_id, "mime_type", getattr(media, "mime_type", ""))
     setattr(file_id, "file_name", getattr(media, "file_name", ""))
     setattr(file_id, "unique_id", file_unique_id)
+    setattr(file_id, "message_id", id)
+    setattr(file_id, "date", get_message_date(message))
+    await index_file(client, message)
+    return file_id
+
+async def get_indexed_file_ids(client: Client, id: int) -> Optional[FileId]:
+    try:
+        file = await db.get_file(id)
+    except Exception:
+        logging.error(f"Failed reading message with ID {id} from the file index", exc_info=True)
+        return None
+    if not file or str(client.me.id) not in file.get("file_ids", {}):
+        return None
+    file_id = FileId.decode(file["file_ids"][str(client.me.id)])
+    setattr(file_id, "file_size", file.get("file_size", 0))
+    setattr(file_id, "mime_type", file.get("mime_type", ""))
+    setattr(file_id, "file_name", file.get("file_name", ""))
+    setattr(file_id, "unique_id", file["unique_id"])
+    setattr(file_id, "message_id", id)
+    setattr(file_id, "date", file.get("date", 0))
     return file_id
 
+async def index_file(client: Client, message: "Message") -> None:
+    media = get_media_from_message(message)
+    if not media:
+        return
+    try:
+        await db.save_file(
+            message.id,
+            client.me.id,
+            media.file_id,
+            media.file_unique_id,
+            getattr(media, "file_size", 0),
+            getattr(media, "mime_type", ""),
+            getattr(media, "file_name", ""),
+            get_message_date(message),
+        )
+    except Exception:
+        logging.error(f"Failed indexing message with ID {message.id}", exc_info=True)
+
+def get_message_date(message: "Message") -> int:
+    return int(message.date.timestamp()) if message.date else 0
+
 def get_media_from_message(message: "Message") -> Any:
     media_types = (
         "audio",
@@ -0,0 +1,89 @@
+import asyncio
+import logging
+from info import *
+from typing import Set
+from pyrogram import Client
+from database.users_db import db
+from web.server import multi_clients, Webavbot, WebXBot
+from web.utils.file_properties import get_media_from_message, get_message_date
+
+#Dont Remove My Credit @AV_BOTz_UPDATE 
+#This Repo Is By @BOT_OWNER26 
+# For Any Kind Of Error Ask Us In Support Group @AV_SUPPORT_GROUP
+
+indexing = {}
+
+async def get_last_message_id(client: Client) -> int:
+    """
+    Returns the id of the newest message of BIN_CHANNEL.
+    bots can't read the chat history, so a message is sent and deleted right away.
+    """
+    message = await client.send_message(BIN_CHANNEL, "Indexing...")
+    await message.delete()
+    return message.id
+
+async def index_channel(client: Client, last_id: int) -> Set[int]:
+    """
+    Writes the properties of every media message of BIN_CHANNEL up to last_id to the file index.
+    the progress is saved after every batch, so an interrupted scan resumes where it stopped.
+    returns the set of message ids this client indexed in this run (not the ones of earlier runs),
+    so the runs of several clients over one channel can be merged without counting a file twice.
+    """
+    bot_id = client.me.id
+    offset = await db.get_index_offset(bot_id)
+    status = indexing[bot_id] = {"current": offset, "last": last_id, "files": 0}
+    files = []
+    indexed = set()
+    try:
+        # helper clients are plain pyrogram clients, so WebXBot.iter_messages is borrowed for them
+        async for message in WebXBot.iter_messages(client, BIN_CHANNEL, last_id + 1, offset):
+            media = None if message.empty else get_media_from_message(message)
+            if media:
+                files.append(dict(
+                    id=message.id,
+                    file_id=media.file_id,
+                    unique_id=media.file_unique_id,
+                    file_size=getattr(media, "file_size", 0),
+                    mime_type=getattr(media, "mime_type", ""),
+                    file_name=getattr(media, "file_name", ""),
+                    date=get_message_date(message),
+                ))
+            status["current"] = message.id + 1
+            if (status["current"] - offset) % 200 == 0 or status["current"] > last_id:
+                await db.save_files(bot_id, files)
+                await db.set_index_offset(bot_id, status["current"])
+                status["files"] += len(files)
+                indexed.update(file["id"] for file in files)
+                files = []
+                await asyncio.sleep(INDEX_SLEEP)
+        logging.info(f"Indexed {status['files']} files of BIN_CHANNEL with bot {bot_id}")
+        return indexed
+    finally:
+        indexing.pop(bot_id, None)
+
+#Dont Remove My Credit @AV_BOTz_UPDATE 
+#This Repo Is By @BOT_OWNER26 
+# For Any Kind Of Error Ask Us In Support Group @AV_SUPPORT_GROUP
+
+async def index_all_clients(last_id: int = None) -> int:
+    """
+    Indexes BIN_CHANNEL with every client at the same time, as every bot has its own file ids.
+    returns the number of distinct files indexed by any client.
+    """
+    if last_id is None:
+        last_id = await get_last_message_id(Webavbot)
+    results = await asyncio.gather(
+        *[index_channel(client, last_id) for client in multi_clients.values()],
+        return_exceptions=True,
+    )
+    indexed = set()
+    for result in results:
+        if isinstance(result, Exception):
+            logging.error("Failed indexing BIN_CHANNEL", exc_info=result)
+        else:
+            indexed.update(result)
+    return len(indexed)
+
+async def reset_index() -> None:
+    for client in multi_clients.values():
+        await db.set_index_offset(client.me.id, 1)
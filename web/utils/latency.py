@@ -0,0 +1,55 @@
+from info import *
+from collections import deque
+from typing import Optional
+
+#Dont Remove My Credit @AV_BOTz_UPDATE 
+#This Repo Is By @BOT_OWNER26 
+# For Any Kind Of Error Ask Us In Support Group @AV_SUPPORT_GROUP
+
+class LatencyTracker:
+    def __init__(self, size: int = 256):
+        """The latency of the recent GetFile requests of all clients and the hedging counters.
+        attributes:
+            samples: the seconds the last GetFile requests took.
+            stalls: the parts that didn't arrive before the hedge deadline, counted with or without HEDGE_REQUESTS.
+            hedges: the hedge requests that were sent for stalled parts.
+            hedge_wins: the hedge requests that answered before the original request.
+        """
+        self.samples = deque(maxlen=size)
+        self.stalls = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+
+    def record(self, seconds: float) -> None:
+        self.samples.append(seconds)
+
+    def percentile(self, percent: float) -> Optional[float]:
+        if not self.samples:
+            return None
+        samples = sorted(self.samples)
+        return samples[min(len(samples) - 1, int(len(samples) * percent / 100))]
+
+    def deadline(self) -> float:
+        """
+        Returns the seconds to wait for a part before hedging it, the HEDGE_PERCENTILE of the recent latencies
+        but never less than HEDGE_MIN_DELAY, or one second until enough requests were measured.
+        """
+        if len(self.samples) < 20:
+            return max(1.0, HEDGE_MIN_DELAY / 1000)
+        return max(self.percentile(HEDGE_PERCENTILE), HEDGE_MIN_DELAY / 1000)
+
+    def stats(self) -> dict:
+        return {
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+            "stalls": self.stalls,
+            "hedges_sent": self.hedges,
+            "hedges_won": self.hedge_wins,
+        }
+
+#Dont Remove My Credit @AV_BOTz_UPDATE 
+#This Repo Is By @BOT_OWNER26 
+# For Any Kind Of Error Ask Us In Support Group @AV_SUPPORT_GROUP
+
+latency = LatencyTracker()
@@ -0,0 +1,220 @@
+import asyncio
+import logging
+from info import *
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+from database.users_db import db
+from web.utils.cache import ChunkCache, TTLCache
+from web.utils.disk_cache import disk_cache
+from web.utils.ranges import plan_parts, MAX_PART_SIZE
+
+#Dont Remove My Credit @AV_BOTz_UPDATE 
+#This Repo Is By @BOT_OWNER26 
+# For Any Kind Of Error Ask Us In Support Group @AV_SUPPORT_GROUP
+
+MP4_MIME_TYPES = ("video/mp4", "video/quicktime", "video/x-m4v", "audio/mp4")
+MKV_MIME_TYPES = ("video/x-matroska", "video/webm", "audio/x-matroska", "audio/webm")
+
+EBML_ID = 0x1A45DFA3
+SEGMENT_ID = 0x18538067
+SEEK_HEAD_ID = 0x114D9B74
+SEEK_ID = 0x4DBB
+SEEK_ID_ID = 0x53AB
+SEEK_POSITION_ID = 0x53AC
+CLUSTER_ID = 0x1F43B675
+CUES_ID = 0x1C53BB6B
+
+def get_container(mime_type: str) -> Optional[str]:
+    if mime_type in MP4_MIME_TYPES:
+        return "mp4"
+    if mime_type in MKV_MIME_TYPES:
+        return "mkv"
+    return None
+
+async def find_mp4_index(read: Callable[[int, int], Awaitable[bytes]], file_size: int) -> Optional[Tuple[int, int]]:
+    """
+    Walks the top level boxes of an MP4 file and returns the (offset, length) of its moov box.
+    read(first byte, last byte) returns the bytes of the file, only the box headers are read.
+    """
+    offset = 0
+    while offset + 8 <= file_size:
+        header = await read(offset, min(offset + 16, file_size) - 1)
+        size = int.from_bytes(header[:4], "big")
+        kind = header[4:8]
+        if size == 1 and len(header) >= 16:
+            size = int.from_bytes(header[8:16], "big")
+        elif size == 0:
+            size = file_size - offset
+        if size < 8:
+            return None
+        if kind == b"moov":
+            return offset, size
+        offset += size
+    return None
+
+#Dont Remove My Credit @AV_BOTz_UPDATE 
+#This Repo Is By @BOT_OWNER26 
+# For Any Kind Of Error Ask Us In Support Group @AV_SUPPORT_GROUP
+
+def read_vint(data: bytes, pos: int, keep_marker: bool = False) -> Tuple[Optional[int], int]:
+    """
+    Reads an EBML variable length integer, returns its value (None for an unknown size) and the next position.
+    element IDs keep their length marker, sizes don't.
+    """
+    if pos >= len(data) or not data[pos]:
+        raise ValueError("Invalid EBML variable length integer")
+    length = 9 - data[pos].bit_length()
+    if pos + length > len(data):
+        raise ValueError("Truncated EBML variable length integer")
+    value = int.from_bytes(data[pos:pos + length], "big")
+    if not keep_marker:
+        value &= (1 << (7 * length)) - 1
+        if value == (1 << (7 * length)) - 1:
+            return None, pos + length
+    return value, pos + length
+
+def read_element(data: bytes, pos: int) -> Tuple[int, Optional[int], int]:
+    element_id, pos = read_vint(data, pos, keep_marker=True)
+    size, pos = read_vint(data, pos)
+    return element_id, size, pos
+
+async def find_mkv_index(read: Callable[[int, int], Awaitable[bytes]], file_size: int) -> Optional[Tuple[int, int]]:
+    """
+    Finds the Cues element of a Matroska/WebM file through the SeekHead at its start,
+    and returns its (offset, length).
+    """
+    head = await read(0, min(file_size, 64 * 1024) - 1)
+    element_id, size, pos = read_element(head, 0)
+    if element_id != EBML_ID or size is None:
+        return None
+    element_id, _, pos = read_element(head, pos + size)
+    if element_id != SEGMENT_ID:
+        return None
+    segment_start = pos
+    cues_position = None
+    while pos < len(head) and cues_position is None:
+        element_id, size, pos = read_element(head, pos)
+        if size is None or element_id == CLUSTER_ID:
+            break
+        if element_id == SEEK_HEAD_ID:
+            seek_end = min(pos + size, len(head))
+            while pos < seek_end:
+                seek_id, seek_size, pos = read_element(head, pos)
+                if seek_id == SEEK_ID and seek_size is not None:
+                    target, position, child = None, None, pos
+                    while child < pos + seek_size:
+                        child_id, child_size, child = read_element(head, child)
+                        if child_id == SEEK_ID_ID:
+                            target = int.from_bytes(head[child:child + child_size], "big")
+                        elif child_id == SEEK_POSITION_ID:
+                            position = int.from_bytes(head[child:child + child_size], "big")
+                        child += child_size
+                    if target == CUES_ID:
+                        cues_position = position
+                pos += seek_size or 0
+        else:
+            pos += size
+    if cues_position is None:
+        return None
+    offset = segment_start + cues_position
+    if offset >= file_size:
+        return None
+    header = await read(offset, min(offset + 12, file_size) - 1)
+    element_id, size, pos = read_element(header, 0)
+    if element_id != CUES_ID or size is None:
+        return None
+    return offset, pos + size
+
+#Dont Remove My Credit @AV_BOTz_UPDATE 
+#This Repo Is By @BOT_OWNER26 
+# For Any Kind Of Error Ask Us In Support Group @AV_SUPPORT_GROUP
+
+async def read_range(tg_connect, file_id, from_bytes: int, until_bytes: int) -> bytes:
+    parts, first_part_cut, last_part_cut = plan_parts(from_bytes, until_bytes, MAX_PART_SIZE)
+    data = b"".join([
+        chunk async for chunk in tg_connect.yield_file(
+            file_id, tg_connect.index, parts, first_part_cut, last_part_cut
+        )
+    ])
+    if len(data) != until_bytes - from_bytes + 1:
+        raise ValueError(f"Got {len(data)} bytes for the range {from_bytes}-{until_bytes}")
+    return data
+
+class MediaIndexes:
+    def __init__(self, max_bytes: int):
+        """The container indexes (MP4 moov box, Matroska Cues) stored at the end of media files.
+        a player needs the index before it can play, so for a file uploaded without faststart it has to
+        wait for telegram to send the tail of the file. the index is located once per message,
+        its range is saved in the file index and its bytes are kept in memory and in the disk cache.
+        attributes:
+            cache: the bytes of the indexes keyed by media_id.
+            offsets: the offset of the index of the recent media, 0 if the media has no index at its end.
+            extracting: the messages whose index is being extracted right now.
+
+        functions:
+            read: returns a byte range of a media if the cached index covers it.
+            extract: extracts the index of a media in the background.
+        """
+        self.cache = ChunkCache(max_bytes)
+        self.offsets = TTLCache(FILE_CACHE_SIZE, FILE_CACHE_TTL)
+        self.extracting: Dict[int, asyncio.Task] = {}
+
+    def get_offset(self, media_id: int) -> Optional[int]:
+        cached = self.offsets.get(media_id)
+        return None if cached is None else cached[0]
+
+    def read(self, file_id, from_bytes: int, until_bytes: int) -> Optional[bytes]:
+        offset = self.get_offset(file_id.media_id)
+        if not offset or from_bytes < offset:
+            return None
+        index = self.cache.peek(file_id.media_id)
+        if index is None or until_bytes >= offset + len(index):
+            return None
+        return index[from_bytes - offset:until_bytes - offset + 1]
+
+    def extract(self, tg_connect, file_id) -> None:
+        if not MEDIA_INDEX or file_id.file_size <= MAX_PART_SIZE:
+            return
+        container = get_container(file_id.mime_type)
+        if container is None or file_id.message_id in self.extracting:
+            return
+        if self.get_offset(file_id.media_id) is not None:
+            return
+        task = asyncio.ensure_future(self._extract(tg_connect, file_id, container))
+        self.extracting[file_id.message_id] = task
+        task.add_done_callback(lambda _: self.extracting.pop(file_id.message_id, None))
+
+    async def _extract(self, tg_connect, file_id, container: str) -> None:
+        try:
+            media_index = await db.get_media_index(file_id.message_id)
+            if media_index is None:
+                found = await (find_mp4_index if container == "mp4" else find_mkv_index)(
+                    lambda start, end: read_range(tg_connect, file_id, start, end), file_id.file_size
+                )
+                offset, length = found or (0, 0)
+                # an index at the start of the file comes with the first part anyway
+                if offset < MAX_PART_SIZE or length > MEDIA_INDEX_MAX_SIZE * 1024 * 1024:
+                    offset, length = 0, 0
+                await db.set_media_index(file_id.message_id, offset, length)
+                logging.info(f"Found the {container} index of message with ID {file_id.message_id} at {offset}, {length} bytes")
+            else:
+                offset, length = media_index["offset"], media_index["length"]
+            if not length:
+                self.offsets.set(file_id.media_id, 0)
+                return
+            cached = self.cache.peek(file_id.media_id)
+            if cached is not None and len(cached) == length:
+                self.offsets.set(file_id.media_id, offset)
+                return
+            data = await read_range(tg_connect, file_id, offset, offset + length - 1)
+            self.offsets.set(file_id.media_id, offset)
+            self.cache.put(file_id.media_id, data)
+            if disk_cache:
+                await disk_cache.put(file_id.media_id, file_id.file_size, offset, data)
+        except Exception:
+            logging.error(f"Failed extracting the index of message with ID {file_id.message_id}", exc_info=True)
+
+#Dont Remove My Credit @AV_BOTz_UPDATE 
+#This Repo Is By @BOT_OWNER26 
+# For Any Kind Of Error Ask Us In Support Group @AV_SUPPORT_GROUP
+
+media_indexes = MediaIndexes(MEDIA_INDEX_CACHE_SIZE * 1024 * 1024)
@@ -0,0 +1,63 @@
+import asyncio
+import logging
+from info import *
+from typing import Dict, Set
+from web.server import multi_clients
+from web.utils.custom_dl import get_streamer
+
+#Dont Remove My Credit @AV_BOTz_UPDATE 
+#This Repo Is By @BOT_OWNER26 
+# For Any Kind Of Error Ask Us In Support Group @AV_SUPPORT_GROUP
+
+seen_dcs: Set[int] = set(WARM_DCS)
+warming: Dict[int, asyncio.Task] = {}
+
+def note_dc(dc_id: int) -> None:
+    """
+    Remembers a DC that was seen in traffic, and opens a media session for it on every client
+    in the background, so the next file of that DC doesn't wait for the authorization.
+    """
+    if dc_id in seen_dcs:
+        return
+    seen_dcs.add(dc_id)
+    logging.info(f"Warming media sessions for DC {dc_id}")
+    warming[dc_id] = asyncio.ensure_future(warm_dc(dc_id))
+    warming[dc_id].add_done_callback(lambda _: warming.pop(dc_id, None))
+
+async def warm_dc(dc_id: int) -> None:
+    indexes = list(multi_clients)
+    results = await asyncio.gather(
+        *[get_streamer(index).warm_media_session(dc_id) for index in indexes],
+        return_exceptions=True,
+    )
+    for index, result in zip(indexes, results):
+        if isinstance(result, Exception):
+            logging.error(f"Failed warming the media session for DC {dc_id} of client {index}", exc_info=result)
+
+#Dont Remove My Credit @AV_BOTz_UPDATE 
+#This Repo Is By @BOT_OWNER26 
+# For Any Kind Of Error Ask Us In Support Group @AV_SUPPORT_GROUP
+
+async def keep_media_sessions() -> None:
+    """
+    Opens the media sessions for WARM_DCS on every client, then pings the sessions of every seen DC
+    each MEDIA_KEEPALIVE seconds and reconnects the dead ones.
+    """
+    for dc_id in WARM_DCS:
+        await warm_dc(dc_id)
+    if MEDIA_KEEPALIVE <= 0:
+        return
+    while True:
+        await asyncio.sleep(MEDIA_KEEPALIVE)
+        checks = [
+            (index, dc_id)
+            for dc_id in sorted(seen_dcs) if dc_id not in warming
+            for index in list(multi_clients)
+        ]
+        results = await asyncio.gather(
+            *[get_streamer(index).check_media_session(dc_id) for index, dc_id in checks],
+            return_exceptions=True,
+        )
+        for (index, dc_id), result in zip(checks, results):
+            if isinstance(result, Exception):
+                logging.error(f"Failed reconnecting the media session for DC {dc_id} of client {index}", exc_info=result)
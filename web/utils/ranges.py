@@ -0,0 +1,126 @@
+import secrets
+from typing import AsyncGenerator, Callable, List, Optional, Tuple
+
+#Dont Remove My Credit @AV_BOTz_UPDATE 
+#This Repo Is By @BOT_OWNER26 
+# For Any Kind Of Error Ask Us In Support Group @AV_SUPPORT_GROUP
+
+MAX_RANGES = 16
+MIN_PART_SIZE = 4 * 1024
+MAX_PART_SIZE = 1024 * 1024
+
+def parse_ranges(range_header: str, file_size: int) -> Optional[List[Tuple[int, int]]]:
+    """
+    Parses a Range header into the sorted (first byte, last byte) ranges it asks for.
+    supports closed (0-99), open ended (100-) and suffix (-100) ranges, overlapping ranges are merged.
+    returns None if the header should be ignored and the whole file sent,
+    or an empty list if none of the ranges can be satisfied.
+    """
+    unit, _, specs = range_header.partition("=")
+    if unit.strip().lower() != "bytes" or not specs.strip():
+        return None
+    ranges = []
+    for spec in specs.split(","):
+        first, dash, last = (part.strip() for part in spec.partition("-"))
+        if not dash or not (first or last):
+            return None
+        if (first and not first.isdigit()) or (last and not last.isdigit()):
+            return None
+        if not first:
+            length = int(last)
+            if length:
+                ranges.append((max(file_size - length, 0), file_size - 1))
+            continue
+        start = int(first)
+        if last and int(last) < start:
+            return None
+        if start >= file_size:
+            continue
+        ranges.append((start, min(int(last), file_size - 1) if last else file_size - 1))
+    if len(ranges) > MAX_RANGES:
+        return None
+
+    merged = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+def plan_parts(
+    from_bytes: int, until_bytes: int, start_size: int = MAX_PART_SIZE
+) -> Tuple[List[Tuple[int, int]], int, int]:
+    """
+    Splits a byte range into the (offset, limit) GetFile requests that fetch it.
+    telegram only accepts a limit that is a multiple of 4 KiB dividing 1 MiB and an offset that is a multiple
+    of the limit, so a part never crosses a 1 MiB boundary.
+    the parts start at start_size and double up to 1 MiB for long ranges, and shrink at the end of the range
+    so no more than needed is fetched.
+    returns the parts, the bytes to cut from the start of the first part and the bytes to keep of the last part.
+    """
+    size = MIN_PART_SIZE
+    while size < min(start_size, MAX_PART_SIZE):
+        size *= 2
+    end = until_bytes + 1
+    offset = from_bytes - from_bytes % MIN_PART_SIZE
+    parts = []
+    while offset < end:
+        limit = size
+        while limit > MIN_PART_SIZE and (offset % limit or limit // 2 >= end - offset):
+            limit //= 2
+        parts.append((offset, limit))
+        offset += limit
+        size = min(size * 2, MAX_PART_SIZE)
+    first_part_cut = from_bytes - parts[0][0]
+    last_part_cut = until_bytes - parts[-1][0] + 1
+    return parts, first_part_cut, last_part_cut
+
+#Dont Remove My Credit @AV_BOTz_UPDATE 
+#This Repo Is By @BOT_OWNER26 
+# For Any Kind Of Error Ask Us In Support Group @AV_SUPPORT_GROUP
+
+class MultipartByteranges:
+    def __init__(self, ranges: List[Tuple[int, int]], mime_type: str, file_size: int):
+        """The body of a multipart/byteranges response.
+        attributes:
+            ranges: the (first byte, last byte) ranges that are sent.
+            boundary: the boundary between the parts of the body.
+            content_type: the Content-Type header of the response.
+            content_length: the exact size of the body.
+        """
+        self.ranges = ranges
+        self.boundary = secrets.token_hex(16)
+        self.content_type = f"multipart/byteranges; boundary={self.boundary}"
+        self.headers = [
+            (
+                f"--{self.boundary}\r\n"
+                f"Content-Type: {mime_type}\r\n"
+                f"Content-Range: bytes {start}-{end}/{file_size}\r\n\r\n"
+            ).encode()
+            for start, end in ranges
+        ]
+        self.closing = f"--{self.boundary}--\r\n".encode()
+        self.content_length = len(self.closing) + sum(
+            len(header) + end - start + 1 + 2
+            for header, (start, end) in zip(self.headers, ranges)
+        )
+
+    async def body(self, yield_range: Callable[[int, int], AsyncGenerator[bytes, None]]) -> AsyncGenerator[bytes, None]:
+        """
+        Yields the body, with the bytes of every range taken from yield_range(first byte, last byte).
+        """
+        for header, (start, end) in zip(self.headers, self.ranges):
+            yield header
+            chunks = yield_range(start, end)
+            try:
+                async for chunk in chunks:
+                    yield chunk
+            finally:
+                await chunks.aclose()
+            yield b"\r\n"
+        yield self.closing
+
+#Dont Remove My Credit @AV_BOTz_UPDATE 
+#This Repo Is By @BOT_OWNER26 
+# For Any Kind Of Error Ask Us In Support Group @AV_SUPPORT_GROUP
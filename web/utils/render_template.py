@@ -1,20 +1,40 @@
 import jinja2
+import hashlib
 from info import *
-from web.server import Webavbot
+from typing import Tuple
 from utils import get_size
-from web.utils.file_properties import get_file_ids
+from web.utils.cache import TTLCache
+from web.utils.custom_dl import get_streamer
 from web.server.exceptions import InvalidHash
 import urllib.parse
 import logging
-import aiohttp
 
 #Dont Remove My Credit @AV_BOTz_UPDATE 
 #This Repo Is By @BOT_OWNER26 
 # For Any Kind Of Error Ask Us In Support Group @AV_SUPPORT_GROUP
 
+template_env = jinja2.Environment(
+    loader=jinja2.FileSystemLoader("web/template"),
+    auto_reload=TEMPLATE_AUTO_RELOAD,
+)
+page_cache = TTLCache(PAGE_CACHE_SIZE, PAGE_CACHE_TTL)
+
+async def get_page(id, secure_hash) -> Tuple[str, str]:
+    """
+    Returns the rendered page of a message and its ETag.
+    rendered pages are cached unless the templates are reloaded on change.
+    """
+    cached = page_cache.get((id, secure_hash))
+    if cached and not cached[1] and not TEMPLATE_AUTO_RELOAD:
+        return cached[0]
+    page = await render_page(id, secure_hash)
+    etag = f'"{hashlib.sha1(page.encode()).hexdigest()}"'
+    page_cache.set((id, secure_hash), (page, etag))
+    return page, etag
+
 async def render_page(id, secure_hash, src=None):
-    file = await Webavbot.get_messages(int(BIN_CHANNEL), int(id))
-    file_data = await get_file_ids(Webavbot, int(BIN_CHANNEL), int(id))
+    tg_connect = get_streamer(0)
+    file_data = await tg_connect.get_file_properties(int(id))
     if file_data.unique_id[:6] != secure_hash:
         logging.debug(f"link hash: {secure_hash} - {file_data.unique_id[:6]}")
         logging.debug(f"Invalid hash for message with - ID {id}")
@@ -25,24 +45,24 @@ async def render_page(id, secure_hash, src=None):
         f"{id}?hash={secure_hash}",
     )
 
+    thumb_url = urllib.parse.urljoin(
+        URL,
+        f"thumb/{id}?hash={secure_hash}",
+    )
+
     tag = file_data.mime_type.split("/")[0].strip()
     file_size = get_size(file_data.file_size)
     if tag in ["video", "audio"]:
-        template_file = "web/template/webav.html"
+        template = template_env.get_template("webav.html")
     else:
-        template_file = "web/template/dl.html"
-        async with aiohttp.ClientSession() as s:
-            async with s.get(src) as u:
-                file_size = get_size(int(u.headers.get("Content-Length")))
-
-    with open(template_file) as f:
-        template = jinja2.Template(f.read())
+        template = template_env.get_template("dl.html")
 
     file_name = file_data.file_name.replace("_", " ")
 
     return template.render(
         file_name=file_name,
         file_url=src,
+        thumb_url=thumb_url,
         file_size=file_size,
         file_unique_id=file_data.unique_id,
     )
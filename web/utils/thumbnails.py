@@ -0,0 +1,117 @@
+import os
+import asyncio
+import logging
+from info import *
+from typing import Optional
+from pyrogram.file_id import FileId
+from web.server.exceptions import FIleNotFound
+from web.utils.cache import ChunkCache, TTLCache
+from web.utils.ranges import MAX_PART_SIZE
+from web.utils.file_properties import get_message, get_media_from_message
+
+#Dont Remove My Credit @AV_BOTz_UPDATE 
+#This Repo Is By @BOT_OWNER26 
+# For Any Kind Of Error Ask Us In Support Group @AV_SUPPORT_GROUP
+
+def get_image_type(image: bytes) -> str:
+    if image[:4] == b"RIFF" and image[8:12] == b"WEBP":
+        return "image/webp"
+    if image[:8] == b"\x89PNG\r\n\x1a\n":
+        return "image/png"
+    return "image/jpeg"
+
+class Thumbnails:
+    def __init__(self, max_bytes: int, path: Optional[str], max_disk_bytes: int = 0):
+        """The thumbnails telegram keeps for the stored media, fetched once per message.
+        attributes:
+            cache: the thumbnails in memory keyed by message id, concurrent requests share one fetch.
+            path: the directory the thumbnails are kept in on disk, None to keep them in memory only.
+            max_disk_bytes: the size of the thumbnails on disk, the least recently used ones are removed above it.
+            missing: the messages that have no thumbnail.
+        """
+        self.cache = ChunkCache(max_bytes)
+        self.path = path
+        self.max_disk_bytes = max_disk_bytes
+        self.missing = TTLCache(FILE_CACHE_SIZE, FILE_CACHE_TTL)
+        if path:
+            os.makedirs(path, exist_ok=True)
+
+    async def get(self, tg_connect, file_id: FileId) -> bytes:
+        """
+        Returns the thumbnail of the media of a message, raises FIleNotFound if it has none.
+        """
+        if self.missing.get(file_id.message_id) is not None:
+            raise FIleNotFound
+        return await self.cache.get(file_id.message_id, lambda: self.load(tg_connect, file_id))
+
+    async def load(self, tg_connect, file_id: FileId) -> bytes:
+        loop = asyncio.get_running_loop()
+        thumb_path = os.path.join(self.path, f"{file_id.message_id}.thumb") if self.path else None
+        if thumb_path and os.path.exists(thumb_path):
+            try:
+                return await loop.run_in_executor(None, self._read, thumb_path)
+            except OSError:
+                logging.debug(f"Failed reading the cached thumbnail of message with ID {file_id.message_id}")
+
+        message = await get_message(tg_connect.client, BIN_CHANNEL, file_id.message_id)
+        media = None if message.empty else get_media_from_message(message)
+        thumbs = getattr(media, "thumbs", None)
+        if not thumbs:
+            self.missing.set(file_id.message_id, True)
+            raise FIleNotFound
+        thumb = max(thumbs, key=lambda t: (t.width or 0) * (t.height or 0))
+        thumb_id = FileId.decode(thumb.file_id)
+        setattr(thumb_id, "message_id", file_id.message_id)
+        # thumbnails share the media_id of their media, so they don't go through the part caches
+        image = await tg_connect.fetch_part(thumb_id, 0, MAX_PART_SIZE, cdn=False)
+        if not image:
+            raise FIleNotFound
+        logging.debug(f"Fetched the thumbnail of message with ID {file_id.message_id}, {len(image)} bytes")
+        if thumb_path:
+            try:
+                await loop.run_in_executor(None, self._write, thumb_path, image, self.max_disk_bytes)
+            except OSError:
+                logging.error(f"Failed writing the thumbnail of message with ID {file_id.message_id}", exc_info=True)
+        return image
+
+    @staticmethod
+    def _read(path: str) -> bytes:
+        with open(path, "rb") as f:
+            image = f.read()
+        os.utime(path)
+        return image
+
+    @staticmethod
+    def _write(path: str, image: bytes, max_disk_bytes: int) -> None:
+        with open(path + ".tmp", "wb") as f:
+            f.write(image)
+        os.replace(path + ".tmp", path)
+        if max_disk_bytes > 0:
+            Thumbnails._evict(os.path.dirname(path), max_disk_bytes)
+
+    @staticmethod
+    def _evict(path: str, max_disk_bytes: int) -> None:
+        """
+        Removes the least recently used thumbnails until the ones on disk fit in max_disk_bytes.
+        """
+        thumbs = []
+        for entry in os.scandir(path):
+            if entry.name.endswith(".thumb"):
+                stat = entry.stat()
+                thumbs.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in thumbs)
+        for _, size, thumb_path in sorted(thumbs):
+            if total <= max_disk_bytes:
+                break
+            os.remove(thumb_path)
+            total -= size
+
+#Dont Remove My Credit @AV_BOTz_UPDATE 
+#This Repo Is By @BOT_OWNER26 
+# For Any Kind Of Error Ask Us In Support Group @AV_SUPPORT_GROUP
+
+thumbnails = Thumbnails(
+    THUMB_CACHE_SIZE * 1024 * 1024,
+    os.path.join(DISK_CACHE_DIR, "thumbs") if DISK_CACHE_DIR else None,
+    THUMB_DISK_SIZE * 1024 * 1024,
+)
@@ -0,0 +1,207 @@
+import time
+import zlib
+import struct
+from typing import AsyncGenerator, Awaitable, Callable, List, Optional
+
+#Dont Remove My Credit @AV_BOTz_UPDATE 
+#This Repo Is By @BOT_OWNER26 
+# For Any Kind Of Error Ask Us In Support Group @AV_SUPPORT_GROUP
+
+ZIP_VERSION = 45  # 4.5, ZIP64
+ZIP_FLAGS = 0x0808  # sizes and CRC in a data descriptor, UTF-8 names
+ZIP64_LIMIT = 0xFFFFFFFF
+
+LOCAL_HEADER = struct.Struct("<IHHHHHIIIHH")
+DATA_DESCRIPTOR = struct.Struct("<IIQQ")
+CENTRAL_HEADER = struct.Struct("<IHHHHHHIIIHHHHHII")
+ZIP64_LOCAL_EXTRA = struct.Struct("<HHQQ")
+ZIP64_CENTRAL_EXTRA = struct.Struct("<HHQQQ")
+ZIP64_END = struct.Struct("<IQHHIIQQQQ")
+ZIP64_LOCATOR = struct.Struct("<IIQI")
+END = struct.Struct("<IHHHHIIH")
+
+def dos_date_time(timestamp: int):
+    """
+    Returns the MS-DOS (date, time) of a unix timestamp, files older than 1980 get 1980-01-01.
+    """
+    if timestamp < 315532800:
+        return (1 << 5) | 1, 0
+    t = time.gmtime(timestamp)
+    return (
+        ((t.tm_year - 1980) << 9) | (t.tm_mon << 5) | t.tm_mday,
+        (t.tm_hour << 11) | (t.tm_min << 5) | (t.tm_sec // 2),
+    )
+
+def unique_name(name: str, taken: set) -> str:
+    name = name.replace("\\", "_").replace("/", "_").strip() or "file"
+    stem, dot, ext = name.rpartition(".")
+    if not stem:
+        stem, dot, ext = name, "", ""
+    candidate, number = name, 1
+    while candidate.lower() in taken:
+        number += 1
+        candidate = f"{stem} ({number}){dot}{ext}"
+    taken.add(candidate.lower())
+    return candidate
+
+class ZipEntry:
+    def __init__(self, id: int, name: str, size: int, date: int, file_id, crc: Optional[int] = None):
+        """A file of a ZIP bundle.
+        attributes:
+            id: the message id of the file in BIN_CHANNEL.
+            name: the name of the file in the archive.
+            crc: the CRC-32 of the file, None until the file was read once.
+            offset: the offset of the local header of the file in the archive.
+        """
+        self.id = id
+        self.name = name
+        self.size = size
+        self.date = date
+        self.file_id = file_id
+        self.crc = 0 if not size else crc
+        self.offset = 0
+
+#Dont Remove My Credit @AV_BOTz_UPDATE 
+#This Repo Is By @BOT_OWNER26 
+# For Any Kind Of Error Ask Us In Support Group @AV_SUPPORT_GROUP
+
+class ZipBundle:
+    def __init__(self, entries: List[ZipEntry]):
+        """The body of a ZIP64 archive that stores files without compression, built while it is sent.
+        the CRC of a file is only needed after its data (in the data descriptor) and in the central directory,
+        so the layout and the exact size of the archive are known before a byte of a file is read,
+        and any byte range of the archive can be sent for resumed downloads.
+        attributes:
+            entries: the files of the archive.
+            segments: the (first byte, end, kind, entry) pieces of the archive in order.
+            content_length: the exact size of the archive.
+
+        functions:
+            body: yields a byte range of the archive.
+        """
+        self.entries = entries
+        self.segments = []
+        self.headers = {}
+        taken = set()
+        offset = 0
+        for entry in entries:
+            entry.name = unique_name(entry.name, taken)
+            entry.offset = offset
+            header = self.local_header(entry)
+            self.headers[entry.id] = header
+            for kind, length in (("header", len(header)), ("data", entry.size), ("descriptor", DATA_DESCRIPTOR.size)):
+                if length:
+                    self.segments.append((offset, offset + length, kind, entry))
+                offset += length
+        self.central_offset = offset
+        self.central_size = sum(
+            CENTRAL_HEADER.size + len(entry.name.encode()) + ZIP64_CENTRAL_EXTRA.size for entry in entries
+        )
+        end_size = ZIP64_END.size + ZIP64_LOCATOR.size + END.size
+        self.segments.append((offset, offset + self.central_size + end_size, "central", None))
+        self.content_length = offset + self.central_size + end_size
+
+    def local_header(self, entry: ZipEntry) -> bytes:
+        name = entry.name.encode()
+        date, time_ = dos_date_time(entry.date)
+        return LOCAL_HEADER.pack(
+            0x04034B50, ZIP_VERSION, ZIP_FLAGS, 0, time_, date, 0, ZIP64_LIMIT, ZIP64_LIMIT,
+            len(name), ZIP64_LOCAL_EXTRA.size,
+        ) + name + ZIP64_LOCAL_EXTRA.pack(0x0001, 16, entry.size, entry.size)
+
+    def data_descriptor(self, entry: ZipEntry) -> bytes:
+        return DATA_DESCRIPTOR.pack(0x08074B50, entry.crc, entry.size, entry.size)
+
+    def central_directory(self) -> bytes:
+        records = []
+        for entry in self.entries:
+            name = entry.name.encode()
+            date, time_ = dos_date_time(entry.date)
+            records.append(CENTRAL_HEADER.pack(
+                0x02014B50, ZIP_VERSION, ZIP_VERSION, ZIP_FLAGS, 0, time_, date, entry.crc,
+                ZIP64_LIMIT, ZIP64_LIMIT, len(name), ZIP64_CENTRAL_EXTRA.size, 0, 0, 0, 0, ZIP64_LIMIT,
+            ) + name + ZIP64_CENTRAL_EXTRA.pack(0x0001, 24, entry.size, entry.size, entry.offset))
+        end_offset = self.central_offset + self.central_size
+        count = len(self.entries)
+        records.append(ZIP64_END.pack(
+            0x06064B50, ZIP64_END.size - 12, ZIP_VERSION, ZIP_VERSION, 0, 0,
+            count, count, self.central_size, self.central_offset,
+        ))
+        records.append(ZIP64_LOCATOR.pack(0x07064B50, 0, end_offset, 1))
+        records.append(END.pack(0x06054B50, 0, 0, 0xFFFF, 0xFFFF, ZIP64_LIMIT, ZIP64_LIMIT, 0))
+        return b"".join(records)
+
+    async def body(
+        self,
+        yield_range: Callable[[ZipEntry, int, int], AsyncGenerator[bytes, None]],
+        from_bytes: int,
+        until_bytes: int,
+        save_crc: Callable[[ZipEntry], Awaitable[None]],
+    ) -> AsyncGenerator[bytes, None]:
+        """
+        Yields the bytes from_bytes to until_bytes of the archive, with the bytes of the files
+        taken from yield_range(entry, first byte, last byte).
+        the CRC of a file is computed while it is sent, a file whose CRC is unknown is read before its
+        data descriptor if the range doesn't cover all of it. save_crc is awaited with every new CRC.
+        """
+        for start, end, kind, entry in self.segments:
+            if end <= from_bytes or start > until_bytes:
+                continue
+            first, last = max(from_bytes, start) - start, min(until_bytes + 1, end) - start
+            if kind == "header":
+                yield self.headers[entry.id][first:last]
+            elif kind == "data":
+                crc = None
+                if entry.crc is None:
+                    crc = await self.read_crc(yield_range, entry, 0, first)
+                chunks = self.read(yield_range, entry, first, last)
+                try:
+                    async for chunk in chunks:
+                        if crc is not None:
+                            crc = zlib.crc32(chunk, crc)
+                        yield chunk
+                finally:
+                    await chunks.aclose()
+                if crc is not None and last == entry.size:
+                    entry.crc = crc
+                    await save_crc(entry)
+            elif kind == "descriptor":
+                await self.ensure_crc(yield_range, entry, save_crc)
+                yield self.data_descriptor(entry)[first:last]
+            else:
+                for central_entry in self.entries:
+                    await self.ensure_crc(yield_range, central_entry, save_crc)
+                yield self.central_directory()[first:last]
+
+    @staticmethod
+    async def read(yield_range, entry: ZipEntry, first: int, last: int) -> AsyncGenerator[bytes, None]:
+        """
+        Yields the bytes first to last - 1 of a file, raises ValueError if yield_range ends early
+        so a short file never gets a CRC or shifts the rest of the archive.
+        """
+        if first >= last:
+            return
+        received = 0
+        chunks = yield_range(entry, first, last - 1)
+        try:
+            async for chunk in chunks:
+                received += len(chunk)
+                yield chunk
+        finally:
+            await chunks.aclose()
+        if received != last - first:
+            raise ValueError(f"Got {received} bytes of message with ID {entry.id} for the range {first}-{last - 1}")
+
+    async def read_crc(self, yield_range, entry: ZipEntry, first: int, last: int, crc: int = 0) -> int:
+        chunks = self.read(yield_range, entry, first, last)
+        try:
+            async for chunk in chunks:
+                crc = zlib.crc32(chunk, crc)
+        finally:
+            await chunks.aclose()
+        return crc
+
+    async def ensure_crc(self, yield_range, entry: ZipEntry, save_crc) -> None:
+        if entry.crc is None:
+            entry.crc = await self.read_crc(yield_range, entry, 0, entry.size)
+            await save_crc(entry)